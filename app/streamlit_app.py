@@ -4,20 +4,11 @@ import streamlit as st
 from pathlib import Path
 import sys
 import json
-import os
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from config.settings import Settings
-from core.intent_classifier import IntentClassifier
-from core.retriever import HybridRetriever
-from core.reranker import LegalReranker
-from core.llm_handler import LegalLLMHandler
-from indexing.vector_store import VectorStore
-from indexing.keyword_index import KeywordIndex
-from validation.answer_validator import AnswerValidator
-from orchestration.workflow import LegalRAGWorkflow
+from orchestration.bootstrap import load_system
 
 st.set_page_config(
     page_title="Legal RAG System",
@@ -25,46 +16,11 @@ st.set_page_config(
     layout="wide"
 )
 
-@st.cache_resource
-def load_system():
-    """Load and cache all system components."""
-    settings = Settings()
-    
-    # Load indices
-    index_dir = Path(settings.index_dir)
-    if not (index_dir / "faiss.index").exists():
-        raise FileNotFoundError(f"FAISS index not found at {index_dir}. Please run the ingestion script first.")
-        
-    vector_store = VectorStore(settings.embedding_model)
-    vector_store.load(settings.index_dir)
-    
-    keyword_index = KeywordIndex()
-    keyword_index.load(settings.index_dir)
-    
-    # Initialize components
-    intent_classifier = IntentClassifier()
-    retriever = HybridRetriever(vector_store, keyword_index)
-    reranker = LegalReranker(settings.reranker_model)
-    
-    # Use key from settings, fallback to env if needed, but settings handles .env loading
-    api_key = settings.groq_api_key or os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY not found in settings or environment")
-        
-    llm_handler = LegalLLMHandler(api_key, model="openai/gpt-oss-120b") # Using a valid Groq model name
-
-    validator = AnswerValidator()
-    
-    # Build workflow
-    workflow = LegalRAGWorkflow(
-        intent_classifier,
-        retriever,
-        reranker,
-        llm_handler,
-        validator
-    )
-    
-    return workflow, settings
+@st.cache_data(max_entries=4)
+def load_build_stats(stats_path: str, mtime: float) -> dict:
+    """Parse build_stats.json; mtime is part of the cache key so a rebuild invalidates it."""
+    with open(stats_path, 'r') as f:
+        return json.load(f)
 
 def main():
     st.title("⚖️ Legal RAG System")
@@ -83,8 +39,7 @@ def main():
         st.header("Indexed Documents")
         stats_path = Path(settings.index_dir) / "build_stats.json"
         if stats_path.exists():
-            with open(stats_path, 'r') as f:
-                stats = json.load(f)
+            stats = load_build_stats(str(stats_path), stats_path.stat().st_mtime)
             
             processed_files = stats.get("files", {})
             if processed_files:
@@ -115,26 +70,25 @@ def main():
         
         with st.spinner("Searching legal database..."):
             try:
-                result = workflow.run(query)
+                result = {}
+                
+                # Display answer as it is generated
+                st.markdown("### Legal Position")
+                st.write_stream(workflow.stream(query, result))
                 
-                # Display results
                 if result.get("error"):
                     st.error(f"Error: {result['error']}")
                     return
                 
-                # Validation status
+                # Validation status (absent when the query was small talk)
                 validation = result.get("validation", {})
                 if validation.get("valid"):
                     st.success(f"✓ Valid Answer (Confidence: {validation.get('confidence', 'unknown')})")
-                else:
+                elif validation:
                     st.error("⚠️ Answer validation failed")
                     for error in validation.get("errors", []):
                         st.error(f"- {error}")
                 
-                # Display answer
-                st.markdown("### Legal Position")
-                st.markdown(result.get("answer", "No answer generated"))
-                
                 # Warnings
                 for warning in validation.get("warnings", []):
                     st.warning(warning)
@@ -9,6 +9,7 @@ sys.path.append(str(Path(__file__).parent / "src"))
 
 from loguru import logger
 from config.legal_guardrails import SUPPORTED_LAWS
+from config.runtime import configure_threads
 from config.settings import Settings
 from ingestion.build_indices_pdf import IndexBuilder
 
@@ -31,6 +32,11 @@ def main():
         action="store_true",
         help="Rebuild indices even if they exist"
     )
+    parser.add_argument(
+        "--yes", "-y",
+        action="store_true",
+        help="Continue without prompting when indices already exist"
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -50,14 +56,19 @@ def main():
 
     # Check if indices already exist
     index_dir = Path(settings.index_dir)
-    if (index_dir / "faiss.index").exists() and not args.rebuild:
+    if (index_dir / "faiss.index").exists() and not (args.rebuild or args.yes):
         logger.warning("Indices already exist. Use --rebuild to force rebuild.")
+        if not sys.stdin.isatty():
+            # No one to answer the prompt (CI, cron, piped input)
+            logger.info("Non-interactive session; aborted. Pass --yes to continue.")
+            return
         response = input("Continue anyway? (y/N): ")
         if response.lower() != 'y':
             logger.info("Aborted.")
             return
     
     # Build indices
+    configure_threads(settings.num_threads)
     builder = IndexBuilder(settings)
     
     try:
@@ -91,6 +102,9 @@ python -m src.ingestion.build_indices --laws constitution bns
 # Rebuild existing indices
 python -m src.ingestion.build_indices --rebuild
 
+# Continue over existing indices without prompting (CI)
+python -m src.ingestion.build_indices --yes
+
 # Dry run (see what would be done)
 python -m src.ingestion.build_indices --dry-run
 
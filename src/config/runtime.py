@@ -0,0 +1,32 @@
+# src/config/runtime.py
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+from loguru import logger
+
+
+def configure_threads(num_threads: Optional[int] = None) -> int:
+    """
+    Use one consistent thread count for torch, FAISS and the BLAS/OpenMP
+    runtimes so embedding, reranking and index search neither oversubscribe
+    nor leave cores idle.
+
+    The environment variables only take effect for runtimes that have not
+    started yet; torch and FAISS are also set directly.
+    """
+    if num_threads is None:
+        # Respects CPU affinity / container limits, unlike os.cpu_count()
+        num_threads = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ.setdefault(var, str(num_threads))
+
+    import faiss
+    import torch
+
+    torch.set_num_threads(num_threads)
+    faiss.omp_set_num_threads(num_threads)
+    logger.info(f"Using {num_threads} compute threads")
+    return num_threads
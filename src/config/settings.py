@@ -23,8 +23,18 @@ class Settings(BaseSettings):
     # Model Configuration
     # ----------------------------
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    # "onnx"/"openvino" need `optimum[onnxruntime]` / `optimum[openvino]`;
+    # e.g. embedding_model_file="onnx/model_qint8_avx512_vnni.onnx" for int8.
+    # "auto": torch on CUDA, else onnx when optimum is installed
+    embedding_backend: Literal["auto", "torch", "onnx", "openvino"] = "auto"
+    embedding_model_file: Optional[str] = None
+    embedding_device: Optional[str] = None  # None: CUDA when available, else CPU
+    encode_batch_size: int = 128
     llm_model: str = "claude-sonnet-4-20250514"
     reranker_model: str = "cross-encoder/ms-marco-MiniLM-L-12-v2"
+    reranker_backend: Literal["torch", "onnx", "openvino"] = "torch"
+    reranker_model_file: Optional[str] = None
+    reranker_max_length: Optional[int] = None  # None: the model's own limit
 
     # ----------------------------
     # Retrieval Configuration
@@ -33,7 +43,24 @@ class Settings(BaseSettings):
     keyword_top_k: int = 10
     final_top_k: int = 5
     vector_weight: float = 0.6
+    hnsw_m: int = 32
+    hnsw_ef_construction: int = 200
+    hnsw_ef_search: int = 64
+    # faiss.index_factory string; None = HNSW{hnsw_m}. "HNSW32,SQ8" stores
+    # vectors as int8 (4x smaller, less memory traffic per search) in the
+    # same graph; "IVF1024,PQ32x8" compresses further for large corpora
+    vector_index_type: Optional[str] = None
+    ivf_nprobe: int = 16
+    # Candidates per hit re-scored exactly, for index types ending in ",RFlat"
+    refine_k_factor: float = 8.0
+    faiss_use_gpu: bool = False  # Needs faiss-gpu; flat/IVF index types only (HNSW stays on CPU)
     keyword_weight: float = 0.4
+    # Serve a query whose embedding is at least this cosine-similar to a
+    # recent query's with that query's vector hits; None disables
+    semantic_cache_threshold: Optional[float] = None
+    semantic_cache_size: int = 256
+    # Query embeddings persisted across restarts; None disables
+    query_embedding_cache_path: Optional[str] = "data/cache/query_embeddings.sqlite"
 
     # ----------------------------
     # Chunking Configuration
@@ -47,6 +74,13 @@ class Settings(BaseSettings):
     max_context_tokens: int = 8000
     llm_temperature: float = 0.0
     llm_max_tokens: int = 2000
+    llm_batch_size: int = 1          # >1 coalesces concurrent queries into one request
+    llm_batch_window_ms: float = 50.0
+
+    # ----------------------------
+    # Compute Configuration
+    # ----------------------------
+    num_threads: Optional[int] = None  # torch/FAISS/BLAS threads; None = CPUs available to the process
 
     # ----------------------------
     # Data Paths
@@ -54,6 +88,9 @@ class Settings(BaseSettings):
     raw_data_dir: str = "data/raw"
     processed_data_dir: str = "data/processed"
     index_dir: str = "data/indices"
+    # Chunk embeddings reused across index builds; kept outside index_dir,
+    # which each build replaces whole
+    chunk_embedding_cache_path: str = "data/cache/chunk_embeddings.sqlite"
 
     # ----------------------------
     # Validation
@@ -1,6 +1,6 @@
 # src/core/chunker.py
-from typing import List, Dict, Optional, Any
-from pydantic import BaseModel, Field
+from typing import List, Dict, Mapping, Optional, Any
+from pydantic import BaseModel, ConfigDict, Field
 import re
 from config.legal_guardrails import SUPPORTED_LAWS
 
@@ -11,6 +11,9 @@ class LegalChunk(BaseModel):
     Legal-aware chunk schema compatible with various Indian laws 
     (Constitution, IPC, BNS, BNSS, IT Act, etc.).
     """
+    # Chunks are built once at ingestion and only read afterwards
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     law_code: str
     law_name: str
     
@@ -41,6 +44,7 @@ class LegalChunk(BaseModel):
     page_number: Optional[int] = None
     chunk_id: str
     metadata: Dict[str, Any] = Field(default_factory=dict)
+    token_count: Optional[int] = None      # Tokens in format_chunk() output, set at indexing
     
     def validate_completeness(self) -> bool:
         """Validate that chunk has minimum viable metadata."""
@@ -50,4 +54,24 @@ class LegalChunk(BaseModel):
             self.identifier_number,
             self.text
         ]
-        return all(required) and len(self.text.strip()) > 0
\ No newline at end of file
+        return all(required) and len(self.text.strip()) > 0
+
+
+def format_chunk(chunk: Mapping[str, Any]) -> str:
+    """Format chunk with full citation, as it appears in the LLM context."""
+    parts = [
+        f"**{chunk['law_name']}**",
+        f"{chunk['identifier_type']} {chunk['identifier_number']}" + 
+        (f" - {chunk['title']}" if chunk.get('title') else ""),
+        f"\n{chunk['text']}",
+    ]
+    
+    if chunk.get('proviso'):
+        parts.append(f"\nProviso: {chunk['proviso']}")
+    
+    if chunk.get('explanation'):
+        parts.append(f"\nExplanation: {chunk['explanation']}")
+    
+    parts.append(f"\nSource: {chunk['source_url']}")
+    
+    return "\n".join(parts)
@@ -1,5 +1,5 @@
 # src/core/intent_classifier.py
-from typing import  List
+from typing import  Dict, List
 from pydantic import BaseModel
 import re
 
@@ -10,6 +10,13 @@ class LegalIntent(BaseModel):
     keywords: List[str] = []
     query_type: str  # definition, penalty, procedure, rights
 
+def _bucket_regex(buckets: Dict[str, List[str]]) -> re.Pattern:
+    """One optional lookahead per bucket, each capturing into a group named after it."""
+    return re.compile("".join(
+        f"(?:(?=.*?(?P<{name}>{'|'.join(map(re.escape, phrases))})))?"
+        for name, phrases in buckets.items()
+    ), re.S)
+
 class IntentClassifier:
     """Classifies legal queries into domains and law types."""
     
@@ -30,6 +37,37 @@ class IntentClassifier:
         "bnss": r"bnss\s+(\d+[a-z]?)",
     }
     
+    LEGAL_KEYWORDS = (
+        "bailable", "cognizable", "non-bailable", "non-cognizable",
+        "imprisonment", "fine", "punishment", "offense",
+        "arrest", "warrant", "summons", "bail",
+    )
+    
+    # Checked in order; the first type with a matching phrase wins
+    QUERY_TYPE_KEYWORDS = {
+        "definition": ["what is", "define", "meaning"],
+        "penalty": ["punishment", "penalty", "fine", "imprisonment"],
+        "procedure": ["procedure", "process", "how to"],
+        "rights": ["right", "can i", "am i allowed"],
+    }
+    
+    # Whole-query greetings/acknowledgements that need no statute lookup.
+    # Kept deliberately narrow: anything else goes through retrieval.
+    SMALL_TALK_PATTERN = r"(hi|hello|hey|thanks|thank you|thank you so much|ok|okay|bye|goodbye|good (morning|afternoon|evening))[\s!.?]*"
+    
+    # Precompiled once per process. The domain/query-type tables are each one
+    # pattern of optional lookaheads, so a single match reports every bucket
+    # that occurs anywhere in the query; the caller then applies priority.
+    _SECTION_RES = {k: re.compile(v) for k, v in SECTION_PATTERNS.items()}
+    _SMALL_TALK_RE = re.compile(SMALL_TALK_PATTERN)
+    
+    _DOMAIN_RE = _bucket_regex(DOMAIN_KEYWORDS)
+    _QUERY_TYPE_RE = _bucket_regex(QUERY_TYPE_KEYWORDS)
+    
+    def needs_retrieval(self, query: str) -> bool:
+        """Return False only for small talk that has no legal content."""
+        return self._SMALL_TALK_RE.fullmatch(query.strip().lower()) is None
+    
     def classify(self, query: str) -> LegalIntent:
         """Classify user query into legal intent."""
         query_lower = query.lower()
@@ -59,8 +97,8 @@ class IntentClassifier:
     
     def _extract_sections(self, query: str) -> List[str]:
         sections = []
-        for pattern_type, pattern in self.SECTION_PATTERNS.items():
-            matches = re.findall(pattern, query)
+        for pattern_type, pattern in self._SECTION_RES.items():
+            matches = pattern.findall(query)
             sections.extend([f"{pattern_type}_{m}" for m in matches])
         return sections
     
@@ -74,11 +112,7 @@ class IntentClassifier:
             return "procedure_criminal"
         
         # Check keywords
-        for domain, keywords in self.DOMAIN_KEYWORDS.items():
-            if any(kw in query for kw in keywords):
-                return domain
-        
-        return "general"
+        return self._first_bucket(self._DOMAIN_RE, query)
     
     def _map_to_law(self, domain: str, query: str, sections: List[str]) -> str:
         mapping = {
@@ -91,20 +125,15 @@ class IntentClassifier:
         return mapping.get(domain, "bns")
     
     def _extract_keywords(self, query: str) -> List[str]:
-        legal_keywords = [
-            "bailable", "cognizable", "non-bailable", "non-cognizable",
-            "imprisonment", "fine", "punishment", "offense",
-            "arrest", "warrant", "summons", "bail",
-        ]
-        return [kw for kw in legal_keywords if kw in query]
+        # Plain substring checks: keywords overlap ("bail" in "non-bailable"),
+        # which a single alternation scan would not report
+        return [kw for kw in self.LEGAL_KEYWORDS if kw in query]
     
     def _classify_query_type(self, query: str) -> str:
-        if any(word in query for word in ["what is", "define", "meaning"]):
-            return "definition"
-        if any(word in query for word in ["punishment", "penalty", "fine", "imprisonment"]):
-            return "penalty"
-        if any(word in query for word in ["procedure", "process", "how to"]):
-            return "procedure"
-        if any(word in query for word in ["right", "can i", "am i allowed"]):
-            return "rights"
-        return "general"
\ No newline at end of file
+        return self._first_bucket(self._QUERY_TYPE_RE, query)
+    
+    @staticmethod
+    def _first_bucket(pattern: re.Pattern, query: str) -> str:
+        """Name of the first group (in table order) that matched, else "general"."""
+        groups = pattern.match(query).groupdict()
+        return next((name for name, hit in groups.items() if hit is not None), "general")
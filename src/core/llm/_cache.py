@@ -0,0 +1,84 @@
+# src/core/llm/_cache.py
+"""On-disk LLM response cache, content-addressed by a SHA-256 of the request."""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from typing import Callable, Iterable, Iterator, Optional
+
+try:
+    from diskcache import Cache
+except ImportError:  # diskcache is optional; responses are then not cached
+    Cache = None
+
+# Set LLM_CACHE_DIR="" to disable caching
+CACHE_DIR = os.getenv("LLM_CACHE_DIR", "data/cache/llm")
+
+_cache: Optional["Cache"] = None
+_lock = threading.Lock()
+
+
+def get_cache() -> Optional["Cache"]:
+    """Process-wide cache, or None when diskcache is missing or caching is off."""
+    global _cache
+    if _cache is None and Cache is not None and CACHE_DIR:
+        with _lock:
+            if _cache is None:
+                _cache = Cache(CACHE_DIR)
+    return _cache
+
+
+def cache_key(parts: Iterable[object]) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\x1f")  # Separator so ("ab", "c") != ("a", "bc")
+    return h.hexdigest()
+
+
+def _cacheable(response: str) -> bool:
+    # An "Error: ..." reply (or an empty one) reports a failure, which may be
+    # temporary; cached, it would be replayed for every identical request
+    return bool(response) and not response.startswith("Error:")
+
+
+def get_or_generate(parts: Iterable[object], generate: Callable[[], str]) -> str:
+    """Return the cached response for ``parts``, calling ``generate`` on a miss."""
+    cache = get_cache()
+    if cache is None:
+        return generate()
+
+    key = cache_key(parts)
+    hit = cache.get(key)
+    if hit is not None:
+        return hit
+    result = generate()
+    if _cacheable(result):
+        cache.set(key, result)
+    return result
+
+
+def stream_or_generate(parts: Iterable[object], stream: Callable[[], Iterator[str]]) -> Iterator[str]:
+    """
+    Yield the cached response for ``parts`` in one piece, or on a miss the
+    pieces ``stream()`` yields, caching their concatenation once it ends.
+    """
+    cache = get_cache()
+    if cache is None:
+        yield from stream()
+        return
+
+    key = cache_key(parts)
+    hit = cache.get(key)
+    if hit is not None:
+        yield hit
+        return
+
+    pieces = []
+    for text in stream():
+        pieces.append(text)
+        yield text
+    result = "".join(pieces)
+    if _cacheable(result):
+        cache.set(key, result)
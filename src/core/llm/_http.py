@@ -0,0 +1,35 @@
+# src/core/llm/_http.py
+"""Process-wide HTTP client shared by the OpenAI-compatible LLM clients."""
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    _HTTP2 = True
+except ImportError:  # h2 is optional; fall back to pooled HTTP/1.1
+    _HTTP2 = False
+
+_client: Optional[httpx.Client] = None
+_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """
+    One pooled client for every LLM client in the process, so TCP/TLS
+    connections are reused across calls and HTTP/2 can multiplex
+    concurrent requests over one socket.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = httpx.Client(
+                    http2=_HTTP2,
+                    timeout=httpx.Timeout(600.0, connect=5.0),  # Long completions; fail fast on connect
+                    limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+                )
+    return _client
@@ -1,7 +1,46 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from typing import Iterator
+
+from core.llm._cache import get_or_generate, stream_or_generate
 
 class BaseLLM(ABC):
     @abstractmethod
     def generate(self, prompt: str, system_prompt: str) -> str:
         pass
+
+    def stream(self, prompt: str, system_prompt: str) -> Iterator[str]:
+        """Yield the response text as it arrives. Backends without a
+        streaming API yield the whole response once."""
+        yield self.generate(prompt, system_prompt)
+
+
+class CachedLLM(BaseLLM):
+    """
+    BaseLLM whose generate() is served from the on-disk response cache.
+    Subclasses implement _generate_impl (and _stream_impl if the provider
+    can stream) and set ``model_name``.
+    """
+    model_name: str
+
+    def _cache_parts(self, prompt: str, system_prompt: str) -> tuple:
+        return (type(self).__name__, self.model_name, system_prompt, prompt)
+
+    def generate(self, prompt: str, system_prompt: str) -> str:
+        return get_or_generate(
+            self._cache_parts(prompt, system_prompt),
+            lambda: self._generate_impl(prompt, system_prompt),
+        )
+
+    def stream(self, prompt: str, system_prompt: str) -> Iterator[str]:
+        return stream_or_generate(
+            self._cache_parts(prompt, system_prompt),
+            lambda: self._stream_impl(prompt, system_prompt),
+        )
+
+    def _stream_impl(self, prompt: str, system_prompt: str) -> Iterator[str]:
+        yield self._generate_impl(prompt, system_prompt)
+
+    @abstractmethod
+    def _generate_impl(self, prompt: str, system_prompt: str) -> str:
+        pass
@@ -1,29 +1,33 @@
+import importlib
+from functools import lru_cache
+
 import yaml
-# from core.llm.anthropic import AnthropicLLM
-# from core.llm.openai import OpenAILLM
-from core.llm.gemini import GeminiLLM
-from core.llm.local import LocalLLM
-from core.llm.groq import GroqLLM
 
+# Provider -> (module, class). Imported only when selected, so loading one
+# provider doesn't import every other provider's SDK
+PROVIDERS = {
+    "groq": ("core.llm.groq", "GroqLLM"),
+    # "anthropic": ("core.llm.anthropic", "AnthropicLLM"),
+    # "openai": ("core.llm.openai", "OpenAILLM"),
+    "gemini": ("core.llm.gemini", "GeminiLLM"),
+    "local": ("core.llm.local", "LocalLLM"),
+}
+
+@lru_cache(maxsize=2)
 def load_llm(config_path: str):
+    """
+    The LLM configured in ``config_path``, built once per process: repeat
+    calls share one client (and its connection pool) rather than reading the
+    config and opening new connections each time.
+    """
     with open(config_path, "r") as f:
         cfg = yaml.safe_load(f)
 
     provider = cfg["provider"]
 
-    if provider == "groq":
-        return GroqLLM(**cfg["groq"])
-
-    # if provider == "anthropic":
-    #     return AnthropicLLM(**cfg["anthropic"])
-
-    # if provider == "openai":
-    #     return OpenAILLM(**cfg["openai"])
-
-    if provider == "gemini":
-        return GeminiLLM(**cfg["gemini"])
-
-    if provider == "local":
-        return LocalLLM(**cfg["local"])
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unsupported LLM provider: {provider}")
+    module_name, class_name = PROVIDERS[provider]
+    llm_cls = getattr(importlib.import_module(module_name), class_name)
 
-    raise ValueError(f"Unsupported LLM provider: {provider}")
+    return llm_cls(**cfg[provider])
@@ -1,16 +1,28 @@
 import google.generativeai as genai
-from core.llm.base import BaseLLM
+from core.llm.base import CachedLLM
 import os
+from typing import Iterator
 
-class GeminiLLM(BaseLLM):
+class GeminiLLM(CachedLLM):
     def __init__(self, api_key_env: str, model: str, max_tokens: int):
         genai.configure(api_key=os.getenv(api_key_env))
         self.model = genai.GenerativeModel(model)
+        self.model_name = model
         self.max_tokens = max_tokens
 
-    def generate(self, prompt: str, system_prompt: str) -> str:
+    def _generate_impl(self, prompt: str, system_prompt: str) -> str:
         response = self.model.generate_content(
             f"{system_prompt}\n\n{prompt}",
             generation_config={"temperature": 0.0},
         )
         return response.text
+
+    def _stream_impl(self, prompt: str, system_prompt: str) -> Iterator[str]:
+        response = self.model.generate_content(
+            f"{system_prompt}\n\n{prompt}",
+            generation_config={"temperature": 0.0},
+            stream=True,
+        )
+        for chunk in response:
+            if chunk.text:
+                yield chunk.text
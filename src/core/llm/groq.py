@@ -1,20 +1,24 @@
 from __future__ import annotations
 
 import os
+from typing import Iterator
 from openai import OpenAI
-from core.llm.base import BaseLLM
+from core.llm.base import CachedLLM
+from core.llm._http import get_http_client
 
 
-class GroqLLM(BaseLLM):
+class GroqLLM(CachedLLM):
     def __init__(self, api_key_env: str, model: str, max_tokens: int):
         self.client = OpenAI(
             api_key=os.getenv(api_key_env),
             base_url="https://api.groq.com/openai/v1",
+            http_client=get_http_client(),
         )
         self.model = model
+        self.model_name = model
         self.max_tokens = max_tokens
 
-    def generate(self, prompt: str, system_prompt: str) -> str:
+    def _generate_impl(self, prompt: str, system_prompt: str) -> str:
         response = self.client.chat.completions.create(
             model=self.model,
             temperature=0.0,
@@ -25,3 +29,18 @@ class GroqLLM(BaseLLM):
             ],
         )
         return response.choices[0].message.content
+
+    def _stream_impl(self, prompt: str, system_prompt: str) -> Iterator[str]:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            temperature=0.0,
+            max_tokens=self.max_tokens,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt},
+            ],
+            stream=True,
+        )
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
@@ -1,13 +1,17 @@
+import json
+from typing import Iterator
 import requests
-from core.llm.base import BaseLLM
+from core.llm.base import CachedLLM
 
-class LocalLLM(BaseLLM):
+class LocalLLM(CachedLLM):
     def __init__(self, model: str, base_url: str):
         self.model = model
+        self.model_name = model
         self.base_url = base_url
+        self.session = requests.Session()  # Keep-alive instead of a new connection per call
 
-    def generate(self, prompt: str, system_prompt: str) -> str:
-        response = requests.post(
+    def _generate_impl(self, prompt: str, system_prompt: str) -> str:
+        response = self.session.post(
             f"{self.base_url}/api/generate",
             json={
                 "model": self.model,
@@ -16,3 +20,23 @@ class LocalLLM(BaseLLM):
             },
         )
         return response.json()["response"]
+
+    def _stream_impl(self, prompt: str, system_prompt: str) -> Iterator[str]:
+        with self.session.post(
+            f"{self.base_url}/api/generate",
+            json={
+                "model": self.model,
+                "prompt": f"{system_prompt}\n\n{prompt}",
+                "stream": True,
+            },
+            stream=True,
+        ) as response:
+            # Ollama streams one JSON object per line
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                part = json.loads(line)
+                if part.get("response"):
+                    yield part["response"]
+                if part.get("done"):
+                    break
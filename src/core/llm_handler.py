@@ -1,10 +1,19 @@
 # src/core/llm_handler.py
 from __future__ import annotations
 
-from typing import List, Dict
+import json
+import threading
+from bisect import bisect_right
+from concurrent.futures import Future
+from itertools import accumulate
+from typing import Iterator, List, Dict, Optional, Tuple
 from anthropic import Anthropic
+from loguru import logger
 
 from config.prompts import LEGAL_SYSTEM_PROMPT
+from core.chunker import format_chunk
+from core.tokens import count_tokens
+from core.llm._cache import get_or_generate, stream_or_generate
 
 class LegalLLMHandler:
     """Handles LLM interaction with strict legal guardrails."""
@@ -17,7 +26,8 @@ class LegalLLMHandler:
         if api_key.startswith("gsk_"):
             try:
                 from groq import Groq
-                self.client = Groq(api_key=api_key)
+                from core.llm._http import get_http_client
+                self.client = Groq(api_key=api_key, http_client=get_http_client())
                 self.provider = "groq"
                 # If model name seems wrong for Groq, maybe default to a safe one
                 # but for now we trust the user or fallback later
@@ -30,70 +40,54 @@ class LegalLLMHandler:
         else:
             self.client = Anthropic(api_key=api_key)
             self.provider = "anthropic"
+
+        # The system prompt never changes between calls, so build its message once
+        self._system_message = {"role": "system", "content": LEGAL_SYSTEM_PROMPT}
     
     def build_context(self, chunks: List[Dict], max_tokens: int = 8000) -> str:
-        """Build citation-first legal context."""
-        context_parts = []
-        current_tokens = 0
-        
-        for chunk in chunks:
-            chunk_text = self._format_chunk(chunk)
-            chunk_tokens = len(chunk_text.split()) * 1.3  # Rough token estimate
-            
-            if current_tokens + chunk_tokens > max_tokens:
-                break
-            
-            context_parts.append(chunk_text)
-            current_tokens += chunk_tokens
-        
-        return "\n\n---\n\n".join(context_parts)
-    
-    def _format_chunk(self, chunk: Dict) -> str:
-        """Format chunk with full citation."""
-        parts = [
-            f"**{chunk['law_name']}**",
-            f"{chunk['identifier_type']} {chunk['identifier_number']}" + 
-            (f" - {chunk['title']}" if chunk.get('title') else ""),
-            f"\n{chunk['text']}",
-        ]
-        
-        if chunk.get('proviso'):
-            parts.append(f"\nProviso: {chunk['proviso']}")
-        
-        if chunk.get('explanation'):
-            parts.append(f"\nExplanation: {chunk['explanation']}")
+        """Build citation-first legal context from the longest prefix of chunks that fits."""
+        # token_count is precomputed at indexing; older indices are counted here
+        counts = [chunk.get('token_count') or count_tokens(self._format_chunk(chunk)) for chunk in chunks]
+        n_fit = bisect_right(list(accumulate(counts)), max_tokens)
         
-        parts.append(f"\nSource: {chunk['source_url']}")
-        
-        return "\n".join(parts)
+        return "\n\n---\n\n".join(self._format_chunk(chunk) for chunk in chunks[:n_fit])
     
-    def generate_answer(self, query: str, context: str) -> str:
-        """Generate answer with strict legal guardrails."""
-        
-        messages = [
-            {
-                "role": "system",
-                "content": LEGAL_SYSTEM_PROMPT
-            },
-            {
-                "role": "user",
-                "content": f"""Query: {query}
+    _format_chunk = staticmethod(format_chunk)
+    
+    def _user_message(self, query: str, context: str) -> Dict:
+        return {
+            "role": "user",
+            "content": f"""Query: {query}
 
 Legal Context:
 {context}
 
 Provide a factual legal position based ONLY on the context above."""
-            }
-        ]
-        
+        }
+    
+    def generate_answer(self, query: str, context: str) -> str:
+        """Generate answer with strict legal guardrails."""
+        return self.complete(self._user_message(query, context))
+    
+    def _cache_parts(self, user_message: Dict, max_tokens: int) -> Tuple:
+        return (self.provider, self.model, LEGAL_SYSTEM_PROMPT, user_message["content"], max_tokens)
+    
+    def complete(self, user_message: Dict, max_tokens: int = 2000) -> str:
+        """Send one user message under the legal system prompt (cached on disk)."""
+        return get_or_generate(
+            self._cache_parts(user_message, max_tokens),
+            lambda: self._complete(user_message, max_tokens),
+        )
+    
+    def _complete(self, user_message: Dict, max_tokens: int) -> str:
         if self.provider == "anthropic":
             # Anthropic uses system param separately
             message = self.client.messages.create(
                 model=self.model,
-                max_tokens=2000,
+                max_tokens=max_tokens,
                 temperature=0.0,
                 system=LEGAL_SYSTEM_PROMPT,
-                messages=[messages[1]] # Only user message
+                messages=[user_message] # Only user message
             )
             return message.content[0].text
             
@@ -101,11 +95,143 @@ Provide a factual legal position based ONLY on the context above."""
             # Groq (OpenAI compatible)
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=messages,
+                messages=[self._system_message, user_message],
                 temperature=0.0,
-                max_tokens=2000,
+                max_tokens=max_tokens,
             )
             return response.choices[0].message.content
         
         return "Error: Unsupported provider"
+    
+    def stream_answer(self, query: str, context: str) -> Iterator[str]:
+        """Like generate_answer, but yield the answer text as it arrives."""
+        user_message = self._user_message(query, context)
+        return stream_or_generate(
+            self._cache_parts(user_message, 2000),
+            lambda: self._stream(user_message),
+        )
+    
+    def _stream(self, user_message: Dict) -> Iterator[str]:
+        if self.provider == "anthropic":
+            with self.client.messages.stream(
+                model=self.model,
+                max_tokens=2000,
+                temperature=0.0,
+                system=LEGAL_SYSTEM_PROMPT,
+                messages=[user_message]
+            ) as stream:
+                yield from stream.text_stream
+            return
+            
+        elif self.provider == "groq":
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[self._system_message, user_message],
+                temperature=0.0,
+                max_tokens=2000,
+                stream=True,
+            )
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+            return
+        
+        yield "Error: Unsupported provider"
+
+
+class BatchingLLMHandler:
+    """
+    Coalesces concurrent generate_answer calls into a single LLM request.
+    
+    Requests arriving within ``window_ms`` of each other (up to
+    ``max_batch_size``) are sent as one prompt asking for a JSON array of
+    answers, which keeps request counts under provider rate limits. If the
+    batched response cannot be parsed, each query is answered individually.
+    """
+    
+    def __init__(self, handler: LegalLLMHandler, max_batch_size: int = 8, window_ms: float = 50.0):
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.window = window_ms / 1000
+        self._pending: List[Tuple[str, str, Future]] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+    
+    def build_context(self, chunks: List[Dict], max_tokens: int = 8000) -> str:
+        return self.handler.build_context(chunks, max_tokens)
+    
+    def stream_answer(self, query: str, context: str) -> Iterator[str]:
+        # Streams are per-user by nature, so they bypass batching
+        return self.handler.stream_answer(query, context)
+    
+    def generate_answer(self, query: str, context: str) -> str:
+        """Queue the query and block until its batch has been answered."""
+        future: Future = Future()
+        batch = None
+        with self._lock:
+            self._pending.append((query, context, future))
+            if len(self._pending) >= self.max_batch_size:
+                batch = self._take_batch()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+        
+        if batch:
+            self._run_batch(batch)
+        return future.result()
+    
+    def _take_batch(self) -> List[Tuple[str, str, Future]]:
+        # Caller must hold self._lock
+        batch, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+    
+    def _flush(self):
+        with self._lock:
+            batch = self._take_batch()
+        if batch:
+            self._run_batch(batch)
+    
+    def _run_batch(self, batch: List[Tuple[str, str, Future]]):
+        answers = None
+        if len(batch) > 1:
+            try:
+                answers = self._generate_batch([(query, context) for query, context, _ in batch])
+            except Exception as e:
+                logger.warning(f"Batched generation failed ({e}); answering individually")
+        
+        for i, (query, context, future) in enumerate(batch):
+            if answers is not None:
+                future.set_result(answers[i])
+                continue
+            try:
+                future.set_result(self.handler.generate_answer(query, context))
+            except Exception as e:
+                future.set_exception(e)
+    
+    def _generate_batch(self, items: List[Tuple[str, str]]) -> List[str]:
+        payload = json.dumps(
+            [{"id": i + 1, "query": query, "legal_context": context} for i, (query, context) in enumerate(items)],
+            ensure_ascii=False,
+        )
+        user_message = {
+            "role": "user",
+            "content": f"""Answer each of the following {len(items)} queries independently, using ONLY its own legal context.
 
+{payload}
+
+Return ONLY a JSON array of {len(items)} strings, where element i is the full answer to query i."""
+        }
+        
+        raw = self.handler.complete(user_message, max_tokens=2000 * len(items)).strip()
+        if raw.startswith("```"):
+            raw = raw.strip("`").removeprefix("json").strip()
+        
+        answers = json.loads(raw)
+        if not (isinstance(answers, list) and len(answers) == len(items)
+                and all(isinstance(a, str) for a in answers)):
+            raise ValueError("response is not a JSON array with one answer per query")
+        return answers
@@ -2,18 +2,38 @@
 # src/core/reranker.py
 from __future__ import annotations
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from sentence_transformers import CrossEncoder
 
 class LegalReranker:
     """Cross-encoder reranker for legal relevance."""
     
-    def __init__(self, model_name: str):
-        self.model = CrossEncoder(model_name)
+    def __init__(self, model_name: str, backend: str = "torch",
+                 model_file: Optional[str] = None, max_length: Optional[int] = None,
+                 batch_size: int = 32):
+        """
+        Args:
+            model_name: cross-encoder model name or path
+            backend: "torch", "onnx" or "openvino" inference backend
+            model_file: Backend weights file inside the model repo
+            max_length: Token limit per (query, chunk) pair; None uses the
+                        model's own. Chunks are whole PDF pages, so a lower
+                        limit truncates most of them before they are scored
+            batch_size: Pairs per forward pass
+        """
+        model_kwargs = {"file_name": model_file} if model_file else None
+        self.model = CrossEncoder(model_name, backend=backend, model_kwargs=model_kwargs,
+                                  max_length=max_length)
+        if backend == "torch" and self.model.model.device.type == "cuda":
+            # fp16 halves memory traffic and uses tensor cores
+            self.model.model.half()
+        self.batch_size = batch_size
     
     def rerank(self, query: str, candidates: List[Dict], top_k: int = 5) -> List[Dict]:
         """Rerank candidates using cross-encoder."""
+        if not candidates:
+            return []
         
         # Prepare pairs
         pairs = []
@@ -21,8 +41,9 @@ class LegalReranker:
             text = f"{candidate.get('title', '')} {candidate['text']}"
             pairs.append([query, text])
         
-        # Score pairs
-        scores = self.model.predict(pairs)
+        scores = self.model.predict(
+            pairs, batch_size=self.batch_size, convert_to_numpy=True, show_progress_bar=False
+        )
         
         # Attach scores
         for candidate, score in zip(candidates, scores):
@@ -3,6 +3,8 @@
 
 from __future__ import annotations
 from typing import List, Dict
+import heapq
+from concurrent.futures import ThreadPoolExecutor
 from indexing.vector_store import VectorStore
 from indexing.keyword_index import KeywordIndex
 
@@ -16,51 +18,54 @@ class HybridRetriever:
         self.keyword_index = keyword_index
         self.vector_weight = vector_weight
         self.keyword_weight = keyword_weight
+        # Both searches spend their time in native code (FAISS / torch /
+        # NumPy) with the GIL released, so they can overlap
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="keyword-search")
     
     def retrieve(self, query: str, top_k: int = 10) -> List[Dict]:
         """Hybrid retrieval with weighted merging."""
         
-        # Get vector results
+        # Keyword search runs in the pool while vector search runs here
+        keyword_future = self._pool.submit(self.keyword_index.search, query, top_k=top_k)
         vector_results = self.vector_store.search(query, top_k=top_k)
-        
-        # Get keyword results
-        keyword_results = self.keyword_index.search(query, top_k=top_k)
+        keyword_results = keyword_future.result()
         
         # Merge and reweight
         merged = self._merge_results(vector_results, keyword_results)
         
-        # Sort by final score
-        merged.sort(key=lambda x: x['final_score'], reverse=True)
+        # Copy only the top_k survivors into results
+        top = heapq.nlargest(top_k, merged.values(), key=lambda entry: entry[0])
         
-        return merged[:top_k]
+        results = []
+        for final_score, v_score, k_score, source in top:
+            result = source.copy()
+            result['vector_score'] = v_score
+            result['keyword_score'] = k_score
+            result['final_score'] = final_score
+            results.append(result)
+        return results
     
-    def _merge_results(self, vector_results: List[Dict], keyword_results: List[Dict]) -> List[Dict]:
-        """Merge and reweight results from both indices."""
+    def _merge_results(self, vector_results: List[Dict], keyword_results: List[Dict]) -> Dict[str, list]:
+        """
+        Merge results from both indices into
+        chunk_id -> [final_score, vector_score, keyword_score, source],
+        accumulating the weighted final score as each result is added.
+        """
         results_map = {}
         
         # Add vector results
         for result in vector_results:
-            chunk_id = result['chunk_id']
-            results_map[chunk_id] = result.copy()
-            results_map[chunk_id]['vector_score'] = result['score']
-            results_map[chunk_id]['keyword_score'] = 0.0
+            score = result['score']
+            results_map[result['chunk_id']] = [self.vector_weight * score, score, 0.0, result]
         
         # Add/update keyword results
         for result in keyword_results:
-            chunk_id = result['chunk_id']
-            if chunk_id in results_map:
-                results_map[chunk_id]['keyword_score'] = result['score']
+            score = result['score']
+            entry = results_map.get(result['chunk_id'])
+            if entry is not None:
+                entry[0] += self.keyword_weight * score
+                entry[2] = score
             else:
-                results_map[chunk_id] = result.copy()
-                results_map[chunk_id]['vector_score'] = 0.0
-                results_map[chunk_id]['keyword_score'] = result['score']
-        
-        # Calculate final scores
-        for chunk_id in results_map:
-            v_score = results_map[chunk_id].get('vector_score', 0)
-            k_score = results_map[chunk_id].get('keyword_score', 0)
-            results_map[chunk_id]['final_score'] = (
-                self.vector_weight * v_score + self.keyword_weight * k_score
-            )
+                results_map[result['chunk_id']] = [self.keyword_weight * score, 0.0, score, result]
         
-        return list(results_map.values())
+        return results_map
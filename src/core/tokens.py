@@ -0,0 +1,21 @@
+# src/core/tokens.py
+from __future__ import annotations
+
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional; counts fall back to a word estimate
+    tiktoken = None
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str) -> int:
+    """Number of BPE tokens in ``text`` (roughly 1.3 per word without tiktoken)."""
+    if tiktoken is None:
+        return int(len(text.split()) * 1.3)
+    return len(_encoding().encode(text, disallowed_special=()))
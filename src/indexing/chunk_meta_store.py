@@ -0,0 +1,145 @@
+# src/indexing/chunk_meta_store.py
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; rows are then parsed with json
+    orjson = None
+
+
+def _loads(data: str) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+class ChunkMetaStore:
+    """
+    SQLite table of chunk metadata keyed by the chunk's FAISS id.
+
+    Rows are JSON-encoded chunk fields (text lives in ``ChunkTextStore``).
+    Searches fetch only the rows of their hits with one ``IN (...)`` query,
+    so the metadata of the whole corpus is never held in memory.
+    """
+
+    # Stay well under SQLite's bound-parameter limit in IN (...) lookups
+    _BATCH = 500
+
+    def __init__(self, name: str = "chunks"):
+        self.name = name
+        self.conn: Optional[sqlite3.Connection] = None
+        self._path: Optional[Path] = None
+        self._read_only = False
+        self._n_saved = 0
+        self._pending: List[str] = []   # Rows added since the last load
+        # Searches may run on worker threads; access is serialised by _lock
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._n_saved + len(self._pending)
+
+    def append(self, meta_json: str):
+        """Add the next row; its id is the current length of the store."""
+        self._pending.append(meta_json)
+
+    def extend(self, meta_jsons: List[str]):
+        self._pending.extend(meta_jsons)
+
+    @staticmethod
+    def encode(fields: Dict[str, Any]) -> str:
+        """Row text for a metadata dict; values JSON can't represent are stringified."""
+        if orjson is not None:
+            return orjson.dumps(fields, default=str).decode("utf-8")
+        return json.dumps(fields, ensure_ascii=False, default=str)
+
+    def get_many(self, ids: Iterable[int]) -> Dict[int, dict]:
+        """Metadata dicts for whichever of ``ids`` exist."""
+        found = {}
+        saved = []
+        for i in ids:
+            if i >= self._n_saved:
+                if i - self._n_saved < len(self._pending):
+                    found[i] = _loads(self._pending[i - self._n_saved])
+            elif i >= 0:
+                saved.append(i)
+        if saved:
+            with self._lock:
+                for start in range(0, len(saved), self._BATCH):
+                    batch = saved[start:start + self._BATCH]
+                    rows = self.conn.execute(
+                        f"SELECT id, chunk_json FROM {self.name} "
+                        f"WHERE id IN ({','.join('?' * len(batch))})",
+                        batch,
+                    )
+                    for i, meta_json in rows:
+                        found[i] = _loads(meta_json)
+        return found
+
+    def save(self, path: str):
+        """Write all rows (saved and pending) to ``path``."""
+        db_path = self._db_path(path)
+        if self._path != db_path or self._read_only:
+            # Written to a fresh file and swapped in, carrying over the rows
+            # of the database this store was loaded from (if any)
+            tmp_path = db_path.with_suffix(".sqlite.tmp")
+            tmp_path.unlink(missing_ok=True)
+            out = sqlite3.connect(str(tmp_path))
+            self._create_table(out)
+            if self.conn is not None:
+                with self._lock:
+                    out.executemany(
+                        f"INSERT INTO {self.name} (id, chunk_json) VALUES (?, ?)",
+                        self.conn.execute(f"SELECT id, chunk_json FROM {self.name} ORDER BY id"),
+                    )
+            self._insert_pending(out)
+            out.commit()
+            out.close()
+            tmp_path.replace(db_path)
+        else:
+            with self._lock:
+                self._insert_pending(self.conn)
+                self.conn.commit()
+        self.load(path)
+
+    def _insert_pending(self, conn: sqlite3.Connection):
+        conn.executemany(
+            f"INSERT INTO {self.name} (id, chunk_json) VALUES (?, ?)",
+            enumerate(self._pending, start=self._n_saved),
+        )
+
+    def _create_table(self, conn: sqlite3.Connection):
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.name} (
+                id INTEGER PRIMARY KEY,
+                chunk_json TEXT NOT NULL
+            )
+        """)
+
+    def load(self, path: str, read_only: bool = False):
+        self.close()
+        self._path = self._db_path(path)
+        self._read_only = read_only
+        if read_only:
+            # Pages are read on demand; nothing can write through this handle
+            self.conn = sqlite3.connect(f"{self._path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            self.conn = sqlite3.connect(str(self._path), check_same_thread=False)
+        self._n_saved = self.conn.execute(f"SELECT COUNT(*) FROM {self.name}").fetchone()[0]
+        self._pending = []
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+            self._path = None
+
+    def _db_path(self, path: str) -> Path:
+        return Path(path) / f"{self.name}.sqlite"
+
+    @staticmethod
+    def exists(path: str, name: str = "chunks") -> bool:
+        return (Path(path) / f"{name}.sqlite").exists()
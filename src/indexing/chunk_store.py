@@ -0,0 +1,98 @@
+# src/indexing/chunk_store.py
+from __future__ import annotations
+
+import mmap
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+
+class ChunkTextStore:
+    """
+    Memory-mapped store of chunk texts.
+
+    Texts are saved as concatenated UTF-8 in ``chunks.bin`` with int64 byte
+    offsets in ``chunks.off.npy``. After ``load`` they live in the OS page
+    cache (shared across worker processes) instead of the Python heap, and
+    are decoded one at a time on access.
+    """
+
+    def __init__(self, name: str = "chunks"):
+        self.name = name
+        self._mm = None
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._path: Optional[Path] = None   # Directory loaded from
+        self._pending: List[str] = []   # Texts added since the last load
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1 + len(self._pending)
+
+    def append(self, text: str):
+        self._pending.append(text)
+
+    def extend(self, texts: List[str]):
+        self._pending.extend(texts)
+
+    def get(self, i: int) -> str:
+        n_mapped = len(self._offsets) - 1
+        if i < n_mapped:
+            return self._mm[self._offsets[i]:self._offsets[i + 1]].decode("utf-8")
+        return self._pending[i - n_mapped]
+
+    def save(self, path: str):
+        """Write all texts (mapped and pending) to ``path``."""
+        encoded = [text.encode("utf-8") for text in self._pending]
+        n_mapped = len(self._offsets) - 1
+
+        offsets = np.empty(n_mapped + len(encoded) + 1, dtype=np.int64)
+        offsets[:n_mapped + 1] = self._offsets
+        np.cumsum([len(b) for b in encoded], out=offsets[n_mapped + 1:])
+        offsets[n_mapped + 1:] += self._offsets[-1]
+
+        bin_path = Path(path) / f"{self.name}.bin"
+        if self._path == Path(path):
+            # Saving back where it was loaded from: append the new texts. The
+            # old offsets never reach past the bytes already there, so a
+            # reader (or this store's map) of the old files is unaffected
+            with open(bin_path, "r+b") as f:
+                f.truncate(int(self._offsets[-1]))   # Bytes of an interrupted save
+                f.seek(0, 2)
+                f.writelines(encoded)
+        else:
+            tmp_path = bin_path.with_suffix(".bin.tmp")
+            with open(tmp_path, "wb") as f:
+                if self._mm is not None:
+                    f.write(self._mm[:self._offsets[-1]])
+                f.writelines(encoded)
+            # Replace rather than overwrite: the old files may still be mapped
+            tmp_path.replace(bin_path)
+        # Offsets last: until they are replaced, the appended bytes are unused
+        off_path = Path(path) / f"{self.name}.off.npy"
+        with open(off_path.with_suffix(".tmp"), "wb") as f:
+            np.save(f, offsets)
+        off_path.with_suffix(".tmp").replace(off_path)
+
+        self.load(path)
+
+    def load(self, path: str):
+        self.close()
+        self._offsets = np.load(Path(path) / f"{self.name}.off.npy", mmap_mode="r")
+        self._path = Path(path)
+        self._pending = []
+        with open(Path(path) / f"{self.name}.bin", "rb") as f:
+            if self._offsets[-1] > 0:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if hasattr(mmap, "MADV_RANDOM"):
+                    # Lookups jump between arbitrary chunks; skip readahead
+                    self._mm.madvise(mmap.MADV_RANDOM)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._path = None
+
+    @staticmethod
+    def exists(path: str, name: str = "chunks") -> bool:
+        return (Path(path) / f"{name}.bin").exists()
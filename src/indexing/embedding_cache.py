@@ -0,0 +1,71 @@
+# src/indexing/embedding_cache.py
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    SQLite cache of embedding vectors keyed by (SHA-256 of text, model).
+
+    Lets an index rebuild re-embed only texts that changed since the last
+    build instead of the whole corpus.
+    """
+
+    # Stay well under SQLite's bound-parameter limit in IN (...) lookups
+    _BATCH = 500
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Index builds embed on a worker thread; access is serialised by _lock
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                hash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vec BLOB NOT NULL,
+                PRIMARY KEY (hash, model)
+            )
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, hashes: List[str], model: str) -> Dict[str, np.ndarray]:
+        """Cached float32 vectors for whichever of ``hashes`` are present."""
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._lock:
+            for start in range(0, len(unique), self._BATCH):
+                batch = unique[start:start + self._BATCH]
+                rows = self.conn.execute(
+                    f"SELECT hash, vec FROM embedding_cache "
+                    f"WHERE model = ? AND hash IN ({','.join('?' * len(batch))})",
+                    (model, *batch),
+                )
+                for h, vec in rows:
+                    found[h] = np.frombuffer(vec, dtype=np.float32)
+        return found
+
+    def put_many(self, hashes: List[str], vectors: np.ndarray, model: str):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache (hash, model, dim, vec) VALUES (?, ?, ?, ?)",
+                ((h, model, vec.shape[0], vec.tobytes()) for h, vec in zip(hashes, vectors)),
+            )
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
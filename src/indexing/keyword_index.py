@@ -1,65 +1,253 @@
 
 # src/indexing/keyword_index.py
 from __future__ import annotations
-from rank_bm25 import BM25Okapi
+from collections import Counter
+from pathlib import Path
 from typing import List, Dict, TYPE_CHECKING
+import json
 import pickle
+import re
 import numpy as np
 
+from indexing.chunk_meta_store import ChunkMetaStore
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; scoring falls back to NumPy
+    njit = None
+
 
 if TYPE_CHECKING:
     from core.chunker import LegalChunk
 
+
+# Word characters plus the Devanagari block (\w alone splits words at vowel
+# signs; the danda punctuation U+0964/5 is excluded). Trailing punctuation
+# ("Section 302.") no longer turns one legal term into two vocabulary entries.
+_TOKEN_RE = re.compile(r"[\w\u0900-\u0963\u0966-\u097f]+")
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.casefold())
+
+
+def _bm25_accumulate_numpy(indptr, doc_ids, weights, term_ids, scores):
+    """Add the precomputed BM25 weights of each query term's postings to ``scores`` in place."""
+    for t in term_ids:
+        start, end = indptr[t], indptr[t + 1]
+        # doc ids are unique within a posting list, so fancy-index += is safe
+        scores[doc_ids[start:end]] += weights[start:end]
+
+
+def _bm25_accumulate_loop(indptr, doc_ids, weights, term_ids, scores):
+    # Terms are walked serially: postings of different terms hit the same
+    # documents, so a prange over terms would race on scores.
+    for i in range(term_ids.shape[0]):
+        t = term_ids[i]
+        for j in range(indptr[t], indptr[t + 1]):
+            scores[doc_ids[j]] += weights[j]
+
+
+if njit is not None:
+    _bm25_accumulate = njit(cache=True, fastmath=True)(_bm25_accumulate_loop)
+else:
+    _bm25_accumulate = _bm25_accumulate_numpy
+
+
 class KeywordIndex:
     """BM25-based keyword index for exact legal term matching."""
-    
+
+    # Okapi BM25 parameters (same defaults as rank_bm25.BM25Okapi)
+    K1 = 1.5
+    B = 0.75
+    EPSILON = 0.25
+
+    # Bumped whenever tokenization or the on-disk layout changes
+    FORMAT_VERSION = 3
+
+    # Saved as plain .npy files under <index_dir>/bm25/ and memory-mapped on load
+    ARRAYS = ("indptr", "doc_ids", "tf", "doc_len", "weights")
+
     def __init__(self):
-        self.bm25 = None
-        self.metadata = []
-        self.corpus_tokens = []
-    
+        # Chunk rows (text included) by document id, fetched per returned hit
+        self.metadata = ChunkMetaStore()
+
+        # Term-major postings (CSC): documents containing term t are
+        # doc_ids[indptr[t]:indptr[t + 1]] with raw term frequencies in tf.
+        # weights holds the full BM25 term score (IDF x saturated,
+        # length-normalised tf) of each posting, so scoring a query is a
+        # gather-and-sum over its terms' postings
+        self.vocab: Dict[str, int] = {}
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.doc_ids = np.zeros(0, dtype=np.int32)
+        self.tf = np.zeros(0, dtype=np.float32)
+        self.doc_len = np.zeros(0, dtype=np.float32)
+        self.weights = np.zeros(0, dtype=np.float32)
+        self.n_docs = 0
+        # (term, doc, tf) triplets and document lengths of documents added
+        # since the postings were last built. Appended per add_chunks call
+        # and sorted into the postings once, on the next search or save
+        self._new_postings: List[tuple] = []
+        self._new_doc_len: List[np.ndarray] = []
+
     def add_chunks(self, chunks: List[LegalChunk]):
         """Add chunks to keyword index."""
-        corpus = []
-        for chunk in chunks:
-            # Create searchable text with legal keywords
-            text = f"{chunk.identifier_type} {chunk.identifier_number} {chunk.title or ''} {chunk.text}"
-            tokens = text.lower().split()
-            corpus.append(tokens)
-            self.corpus_tokens.append(tokens)
-            self.metadata.append(chunk.dict())
-        
-        self.bm25 = BM25Okapi(corpus)
-    
+        # Create searchable text with legal keywords
+        self._add_documents([
+            _tokenize(" ".join((chunk.identifier_type, chunk.identifier_number, chunk.title or "", chunk.text)))
+            for chunk in chunks
+        ])
+        self.metadata.extend([chunk.model_dump_json() for chunk in chunks])
+
+    def _add_documents(self, corpus: List[List[str]]):
+        """Append tokenized documents' postings; they are indexed on the next build."""
+        vocab = self.vocab
+        term_ids, doc_ids, freqs = [], [], []
+        start = self.n_docs + sum(len(lengths) for lengths in self._new_doc_len)
+        for doc_id, tokens in enumerate(corpus, start=start):
+            for term, count in Counter(tokens).items():
+                term_ids.append(vocab.setdefault(term, len(vocab)))
+                doc_ids.append(doc_id)
+                freqs.append(count)
+        self._new_postings.append((
+            np.asarray(term_ids, dtype=np.int32),
+            np.asarray(doc_ids, dtype=np.int32),
+            np.asarray(freqs, dtype=np.float32),
+        ))
+        self._new_doc_len.append(np.fromiter(map(len, corpus), dtype=np.float32, count=len(corpus)))
+
+    def _build_pending(self):
+        """Merge postings appended since the last build into the index."""
+        if not self._new_doc_len:
+            return
+        # Existing postings are expanded back to (term, doc, tf) triplets so
+        # that no token lists need to be kept around between builds
+        old_term_ids = np.repeat(
+            np.arange(len(self.indptr) - 1, dtype=np.int32), np.diff(self.indptr)
+        )
+        term_ids, doc_ids, tf = zip(*self._new_postings)
+        self._build(
+            np.concatenate([old_term_ids, *term_ids]),
+            np.concatenate([self.doc_ids, *doc_ids]),
+            np.concatenate([self.tf, *tf]),
+            np.concatenate([self.doc_len, *self._new_doc_len]),
+        )
+        self._new_postings = []
+        self._new_doc_len = []
+
+    def _build(self, term_ids: np.ndarray, doc_ids: np.ndarray, tf: np.ndarray, doc_len: np.ndarray):
+        """Sort (term, doc, tf) triplets into postings and precompute BM25 weights."""
+        # IDF depends on the whole corpus, so weights are always rebuilt in full.
+        # A stable sort keeps each posting list in ascending doc order.
+        order = np.argsort(term_ids, kind="stable")
+        doc_freq = np.bincount(term_ids, minlength=len(self.vocab))
+        term_ids = term_ids[order]
+
+        self.doc_ids = doc_ids[order]
+        self.tf = tf[order]
+        self.doc_len = doc_len
+        self.indptr = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+        np.cumsum(doc_freq, out=self.indptr[1:])
+        self.n_docs = n_docs = len(doc_len)
+
+        # Okapi IDF; negative values (terms in over half the corpus) are
+        # floored to a fraction of the average IDF, as BM25Okapi does
+        idf = np.log(n_docs - doc_freq + 0.5) - np.log(doc_freq + 0.5)
+        if len(idf):
+            idf[idf < 0] = self.EPSILON * idf.mean()
+
+        k1, b = self.K1, self.B
+        freq = self.tf.astype(np.float64)
+        avgdl = doc_len.mean(dtype=np.float64) if n_docs else 0.0
+        norm = k1 * (1 - b + b * doc_len[self.doc_ids] / avgdl) if n_docs else 0.0
+        self.weights = (idf[term_ids] * freq * (k1 + 1) / (freq + norm)).astype(np.float32)
+
     def search(self, query: str, top_k: int = 10) -> List[Dict]:
         """Keyword-based search."""
-        query_tokens = query.lower().split()
-        scores = self.bm25.get_scores(query_tokens)
-        
-        # Get top-k indices
-        top_indices = np.argsort(scores)[-top_k:][::-1]
-        
+        self._build_pending()
+        term_ids = np.fromiter(
+            (self.vocab[t] for t in _tokenize(query) if t in self.vocab), dtype=np.int32
+        )
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        if len(term_ids):
+            _bm25_accumulate(self.indptr, self.doc_ids, self.weights, term_ids, scores)
+
+        # Get top-k indices: partial selection, then sort only those k
+        k = min(top_k, len(scores))
+        top_indices = np.argpartition(scores, -k)[-k:] if k else np.zeros(0, dtype=np.intp)
+        top_indices = top_indices[np.argsort(-scores[top_indices])]
+
+        # One lookup for all hits
+        ids = top_indices.tolist()
+        rows = self.metadata.get_many(ids)
+
         results = []
-        for idx in top_indices:
-            if idx < len(self.metadata):
-                result = self.metadata[idx].copy()
+        for idx in ids:
+            result = rows.get(idx)
+            if result is not None:
                 result['score'] = float(scores[idx])
                 results.append(result)
-        
+
         return results
-    
+
+    def flush(self, path: str):
+        """
+        Write the chunk rows added so far to ``path``/bm25/ so they are not
+        held in memory until ``save``; the postings stay pending.
+        """
+        out_dir = Path(path) / "bm25"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        self.metadata.save(str(out_dir))
+
     def save(self, path: str):
-        with open(f"{path}/bm25.pkl", 'wb') as f:
-            pickle.dump({
-                'bm25': self.bm25,
-                'metadata': self.metadata,
-                'corpus_tokens': self.corpus_tokens
-            }, f)
-    
+        """
+        Write the index to ``path``/bm25/: one .npy per array, the vocabulary
+        (terms in id order) in index.json and the chunks in chunks.sqlite.
+        """
+        self._build_pending()
+        out_dir = Path(path) / "bm25"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for name in self.ARRAYS:
+            # Replace rather than overwrite: the arrays may be mapped from these files
+            tmp_path = out_dir / f"{name}.npy.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, getattr(self, name))
+            tmp_path.replace(out_dir / f"{name}.npy")
+        with open(out_dir / "index.json", 'w', encoding='utf-8') as f:
+            json.dump({'version': self.FORMAT_VERSION, 'terms': list(self.vocab)}, f, ensure_ascii=False)
+        self.metadata.save(str(out_dir))
+
     def load(self, path: str):
+        in_dir = Path(path) / "bm25"
+        if not (in_dir / "index.json").exists():
+            self._load_pickle(path)
+            return
+
+        with open(in_dir / "index.json", 'r', encoding='utf-8') as f:
+            header = json.load(f)
+
+        if header['version'] != self.FORMAT_VERSION:
+            raise ValueError(
+                f"BM25 index at {in_dir} has format version {header['version']}, "
+                f"expected {self.FORMAT_VERSION}. Rebuild the indices."
+            )
+        self.__init__()
+        self.metadata.load(str(in_dir))
+        self.vocab = {term: i for i, term in enumerate(header['terms'])}
+        for name in self.ARRAYS:
+            # Read-only and paged in on demand; add_chunks copies on rebuild
+            setattr(self, name, np.load(in_dir / f"{name}.npy", mmap_mode='r'))
+        self.n_docs = len(self.doc_len)
+
+    def _load_pickle(self, path: str):
+        """Load a bm25.pkl written by the original rank_bm25-based index."""
+        from core.chunker import LegalChunk
+
         with open(f"{path}/bm25.pkl", 'rb') as f:
             data = pickle.load(f)
-            self.bm25 = data['bm25']
-            self.metadata = data['metadata']
-            self.corpus_tokens = data['corpus_tokens']
 
+        # Postings are rebuilt from the stored whitespace-split tokens,
+        # re-tokenized so the vocabulary matches the current query tokenizer
+        self.__init__()
+        self._add_documents([_tokenize(" ".join(tokens)) for tokens in data['corpus_tokens']])
+        self.metadata.extend([LegalChunk.model_validate(m).model_dump_json() for m in data['metadata']])
@@ -0,0 +1,58 @@
+# src/indexing/semantic_cache.py
+from __future__ import annotations
+
+import threading
+from typing import Any, List, Optional
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    In-memory cache of search results keyed by query embedding.
+
+    A query whose (normalised) embedding has cosine similarity of at least
+    ``threshold`` with a recent query's gets that query's results back, so
+    paraphrases of a recent question skip the index search. Holds at most
+    ``size`` entries; the least recently used one is replaced when full.
+    """
+
+    def __init__(self, threshold: float = 0.95, size: int = 256):
+        self.threshold = threshold
+        self.size = size
+        self._keys: Optional[np.ndarray] = None   # (size, dim), allocated on first put
+        self._values: List[Any] = [None] * size
+        self._last_used = np.zeros(size, dtype=np.int64)  # 0 = empty slot
+        self._clock = 0
+        # Searches may run on worker threads; access is serialised by _lock
+        self._lock = threading.Lock()
+
+    def get(self, embedding: np.ndarray) -> Optional[Any]:
+        """The value stored for the most similar cached query, if similar enough."""
+        with self._lock:
+            if self._keys is None:
+                return None
+            sims = self._keys @ embedding
+            sims[self._last_used == 0] = -np.inf
+            slot = int(np.argmax(sims))
+            if sims[slot] < self.threshold:
+                return None
+            self._clock += 1
+            self._last_used[slot] = self._clock
+            return self._values[slot]
+
+    def put(self, embedding: np.ndarray, value: Any):
+        with self._lock:
+            if self._keys is None:
+                self._keys = np.zeros((self.size, embedding.shape[0]), dtype=np.float32)
+            slot = int(np.argmin(self._last_used))
+            self._clock += 1
+            self._keys[slot] = embedding
+            self._values[slot] = value
+            self._last_used[slot] = self._clock
+
+    def clear(self):
+        with self._lock:
+            self._keys = None
+            self._values = [None] * self.size
+            self._last_used[:] = 0
@@ -1,62 +1,471 @@
 # src/indexing/vector_store.py
 
 from __future__ import annotations
-from typing import List, Dict, TYPE_CHECKING
+from collections.abc import MutableMapping
+from typing import Any, Iterator, List, Dict, Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from core.chunker import LegalChunk
 
 import faiss
 import numpy as np
+from loguru import logger
 from sentence_transformers import SentenceTransformer
+from functools import lru_cache
+import importlib.util
+import os
 import pickle
+import threading
+
+from indexing.chunk_meta_store import ChunkMetaStore
+from indexing.chunk_store import ChunkTextStore
+from indexing.embedding_cache import EmbeddingCache
+from indexing.semantic_cache import SemanticCache
+
+class VectorHit(MutableMapping):
+    """
+    A search result that reads like the chunk's dict plus ``score``, but
+    decodes the chunk text from the memory-mapped store only when ``text``
+    is first read. Hits dropped during merging/ranking never pay for it.
+    """
+    
+    __slots__ = ("id", "_fields", "_texts", "_text_pending")
+    
+    def __init__(self, id: int, fields: Dict[str, Any], texts: ChunkTextStore):
+        self.id = id
+        self._fields = fields
+        self._texts = texts
+        # True until the text is read, set or deleted
+        self._text_pending = "text" not in fields
+    
+    def __getitem__(self, key: str) -> Any:
+        if key == "text" and self._text_pending:
+            self._fields["text"] = self._texts.get(self.id)
+            self._text_pending = False
+        return self._fields[key]
+    
+    def __setitem__(self, key: str, value: Any):
+        if key == "text":
+            self._text_pending = False
+        self._fields[key] = value
+    
+    def __delitem__(self, key: str):
+        if key == "text" and self._text_pending:
+            self._text_pending = False  # Never fetched, and now never will be
+            return
+        del self._fields[key]
+    
+    def __iter__(self) -> Iterator[str]:
+        if self._text_pending:
+            self["text"]
+        return iter(self._fields)
+    
+    def __len__(self) -> int:
+        return len(self._fields) + self._text_pending
+    
+    def copy(self) -> Dict[str, Any]:
+        """A plain dict of every field, text included."""
+        return dict(self)
+    
+    def __repr__(self) -> str:
+        return f"VectorHit(id={self.id}, score={self._fields.get('score')})"
+
 
 class VectorStore:
     """FAISS-based vector store for legal chunks."""
     
-    def __init__(self, embedding_model: str):
-        self.model = SentenceTransformer(embedding_model)
-        self.dimension = self.model.get_sentence_embedding_dimension()
-        self.index = faiss.IndexFlatL2(self.dimension)
-        self.metadata = []
+    # Rows buffered before one index.add: FAISS parallelises a large add
+    # (coarse assignment, encoding) better than many small ones, but the
+    # buffer is also emptied at every flush (once per law while building)
+    ADD_BATCH_ROWS = 10_000
+    # Rows an untrained (IVF/PQ) index buffers to train on; it is trained
+    # on the first TRAIN_ROWS, never on the whole corpus held at once
+    TRAIN_ROWS = 100_000
+    
+    def __init__(self, embedding_model: str, backend: str = "torch",
+                 model_file: Optional[str] = None, hnsw_m: int = 32,
+                 ef_construction: int = 200, ef_search: int = 64,
+                 index_type: Optional[str] = None, nprobe: int = 16,
+                 refine_k_factor: float = 8.0,
+                 device: Optional[str] = None, encode_batch_size: int = 128,
+                 embedding_cache: Optional[EmbeddingCache] = None, use_gpu: bool = False,
+                 semantic_cache: Optional[SemanticCache] = None):
+        """
+        Args:
+            embedding_model: sentence-transformers model name or path
+            backend: "torch", "onnx" or "openvino" inference backend, or
+                     "auto": torch on CUDA, ONNX Runtime on CPU (when
+                     optimum[onnxruntime] is installed)
+            model_file: Backend weights file inside the model repo, e.g.
+                        "onnx/model_qint8_avx512_vnni.onnx" for int8 ONNX
+            hnsw_m: Neighbours per node in the HNSW graph
+            ef_construction: HNSW candidate list size while building
+            ef_search: HNSW candidate list size while searching
+            index_type: faiss.index_factory string, e.g. "HNSW32,SQ8" (int8
+                        vectors) or "IVF1024,PQ32x8"; defaults to "HNSW{hnsw_m}"
+            nprobe: Inverted lists visited per query for IVF indices
+            refine_k_factor: For index types ending in ",RFlat" (e.g.
+                             "IVF1024,PQ48x8,RFlat"): the compressed index
+                             proposes top_k * refine_k_factor candidates,
+                             which are re-scored with the exact vectors
+            device: "cuda", "cpu", ...; None picks CUDA when available.
+                    The torch backend runs in fp16 on CUDA
+            encode_batch_size: Texts per forward pass when embedding chunks
+            embedding_cache: Reuse vectors of unchanged chunk texts across
+                             builds, and of queries across restarts
+            use_gpu: Build and search the FAISS index on GPU 0 when FAISS has
+                     GPU support (faiss-gpu); flat and IVF indices only
+            semantic_cache: Answer queries close enough to a recent one with
+                            its results (cosine indices only)
+        """
+        # The model (seconds to load, hundreds of MB) is loaded on first
+        # use, so a store that is only loaded and saved never pays for it
+        self._model: Optional[SentenceTransformer] = None
+        self._model_lock = threading.Lock()
+        self._model_args = (embedding_model, backend, model_file, device)
+        self._cache_model_key = None
+        self.encode_batch_size = encode_batch_size
+        self.embedding_cache = embedding_cache
+        self.semantic_cache = semantic_cache
+        self.ef_search = ef_search
+        self.nprobe = nprobe
+        self.refine_k_factor = refine_k_factor
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.index_type = index_type or f"HNSW{hnsw_m}"
+        self.use_gpu = use_gpu
+        self._gpu_resources = None
+        self._on_gpu = False
+        # Created on first use: a new index needs the model's dimension
+        self._index: Optional[faiss.Index] = None
+        self.metadata = ChunkMetaStore()   # Chunk fields except text, fetched per hit
+        self.texts = ChunkTextStore()      # Chunk text, memory-mapped once saved
+        # Embeddings (and their ids) not yet in the index: an untrained
+        # (IVF/PQ) index is trained on up to TRAIN_ROWS of them rather than
+        # on the first batch, and a trained one receives them in batches
+        self._pending: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._n_pending = 0
+        self._read_only = False
+        # Queries recur (the same question asked again, warm-up queries);
+        # a repeat skips the model's forward pass. Wraps the bound method
+        # so entries are per store and keyed on the arguments only
+        self._query_embedding = lru_cache(maxsize=1024)(self._encode_query)
+    
+    @property
+    def model(self) -> SentenceTransformer:
+        return self.load_model()
+    
+    def load_model(self) -> SentenceTransformer:
+        """Load the embedding model if it isn't already, and return it."""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._create_model()
+        return self._model
+    
+    def _create_model(self) -> SentenceTransformer:
+        embedding_model, backend, model_file, device = self._model_args
+        auto = backend == "auto"
+        if auto:
+            backend = self._auto_backend(device)
+            if backend == "torch":
+                model_file = None  # Names an ONNX/OpenVINO weights file
+        model_kwargs = {"file_name": model_file} if model_file else None
+        try:
+            model = SentenceTransformer(embedding_model, device=device, backend=backend, model_kwargs=model_kwargs)
+        except Exception as e:
+            if not (auto and backend == "onnx"):
+                raise
+            # e.g. an optimum/onnxruntime version mismatch; torch always works
+            logger.warning(f"ONNX embedding backend failed to load, using torch: {e}")
+            backend, model_file = "torch", None
+            model = SentenceTransformer(embedding_model, device=device, backend=backend)
+        fp16 = backend == "torch" and model.device.type == "cuda"
+        if fp16:
+            # fp16 halves activation memory and runs the GEMMs on tensor
+            # cores; vectors are cast back to float32 before reaching FAISS
+            model.half()
+        # Everything that changes the vectors produced for a given text
+        self._cache_model_key = f"{embedding_model}|{backend}|{model_file or ''}{'|fp16' if fp16 else ''}"
+        return model
+    
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+    
+    @property
+    def index(self) -> faiss.Index:
+        if self._index is None:
+            # Unit-length embeddings + inner product = cosine similarity.
+            # IDMap2 returns explicit chunk ids, the keys of the metadata table
+            self._index = faiss.index_factory(
+                self.dimension, f"IDMap2,{self.index_type}", faiss.METRIC_INNER_PRODUCT
+            )
+            if isinstance(self._base_index(), faiss.IndexHNSW):
+                self._base_index().hnsw.efConstruction = self.ef_construction
+            self._set_search_params()
+            self._index = self._to_gpu(self._index)
+        return self._index
+    
+    @index.setter
+    def index(self, index: faiss.Index):
+        self._index = index
+    
+    @staticmethod
+    def _auto_backend(device: Optional[str]) -> str:
+        """torch on GPU; on CPU, ONNX Runtime's fused graph is several times faster."""
+        import torch
+        
+        on_cuda = device.startswith("cuda") if device else torch.cuda.is_available()
+        if on_cuda or any(importlib.util.find_spec(name) is None for name in ("optimum", "onnxruntime")):
+            return "torch"
+        return "onnx"
     
     def add_chunks(self, chunks: List[LegalChunk]):
         """Add legal chunks to vector index."""
-        texts = []
-        for chunk in chunks:
-            # Create searchable text
-            search_text = f"{chunk.title or ''} {chunk.text} {chunk.proviso or ''}"
-            texts.append(search_text)
-            self.metadata.append(chunk.model_dump())
+        self._check_writable()
+        # Sequential ids: a chunk's id is also its position in the text store
+        ids = np.arange(len(self.metadata), len(self.metadata) + len(chunks), dtype=np.int64)
+        # Create searchable text; one comprehension per column rather than
+        # a Python-level loop appending to three lists
+        texts = [" ".join((chunk.title or "", chunk.text, chunk.proviso or "")) for chunk in chunks]
+        self.metadata.extend([chunk.model_dump_json(exclude={"text"}) for chunk in chunks])
+        self.texts.extend([chunk.text for chunk in chunks])
         
         # Generate embeddings
-        embeddings = self.model.encode(texts, convert_to_numpy=True)
+        embeddings = self._embed(texts)
         
-        # Add to FAISS
-        self.index.add(embeddings.astype('float32'))
+        # Buffer for FAISS. A no-op for float32 output; fp16 (GPU) output is widened here
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        self._pending.append((embeddings, ids))
+        self._n_pending += len(ids)
+        limit = self.ADD_BATCH_ROWS if self.index.is_trained else self.TRAIN_ROWS
+        if self._n_pending >= limit:
+            self._flush_pending()
+    
+    def _add(self, embeddings: np.ndarray, ids: np.ndarray):
+        if isinstance(self.index, faiss.IndexIDMap):
+            self.index.add_with_ids(embeddings, ids)
+        else:
+            # Older index without an id map: ids are implicit positions
+            self.index.add(embeddings)
     
-    def search(self, query: str, top_k: int = 10) -> List[Dict]:
-        """Semantic search."""
-        query_embedding = self.model.encode([query], convert_to_numpy=True)
-        distances, indices = self.index.search(query_embedding.astype('float32'), top_k)
+    def _flush_pending(self):
+        """Add every buffered embedding in one call, training the index on them first if needed."""
+        if not self._pending:
+            return
+        embeddings = np.vstack([e for e, _ in self._pending])
+        ids = np.concatenate([i for _, i in self._pending])
+        self._pending = []
+        self._n_pending = 0
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()  # Cached results predate these chunks
+        # IVF/PQ indices learn their centroids/codebooks first
+        if not self.index.is_trained:
+            self.index.train(embeddings)
+        self._add(embeddings, ids)
+    
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts, encoding each distinct text once."""
+        # Boilerplate (preambles, repeated headings) recurs across acts;
+        # duplicates are mapped onto their first occurrence's row
+        position: Dict[str, int] = {}
+        inverse = np.fromiter(
+            (position.setdefault(text, len(position)) for text in texts), dtype=np.intp, count=len(texts)
+        )
+        embeddings = self._embed_unique(list(position))
+        return embeddings if len(position) == len(texts) else embeddings[inverse]
+    
+    def _embed_unique(self, texts: List[str]) -> np.ndarray:
+        """Embed distinct texts, encoding only those missing from the embedding cache."""
+        if self.embedding_cache is None:
+            return self._encode(texts)
+        
+        self.load_model()  # Resolves the backend recorded in _cache_model_key
+        model_key = f"{self._cache_model_key}|normalize={self._is_cosine}"
+        hashes = [EmbeddingCache.text_hash(text) for text in texts]
+        cached = self.embedding_cache.get_many(hashes, model_key)
+        
+        missing = [i for i, h in enumerate(hashes) if h not in cached]
+        if missing:
+            fresh = self._encode([texts[i] for i in missing])
+            self.embedding_cache.put_many([hashes[i] for i in missing], fresh, model_key)
+            cached.update(zip((hashes[i] for i in missing), fresh))
+        
+        if not hashes:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        return np.vstack([cached[h] for h in hashes])
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(
+            texts,
+            batch_size=self.encode_batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=self._is_cosine,
+            show_progress_bar=True,
+        )
+    
+    def search(self, query: str, top_k: int = 10) -> List[VectorHit]:
+        """Semantic search. Hits load their chunk text on first access."""
+        self._flush_pending()
+        query_embedding = self._query_embedding(query, self._is_cosine)
+        use_semantic_cache = self.semantic_cache is not None and self._is_cosine
+        if use_semantic_cache:
+            cached = self.semantic_cache.get(query_embedding[0])
+            # Usable if it was a search for at least as many hits
+            if cached is not None and cached[0] >= top_k:
+                return [VectorHit(idx, dict(fields), self.texts) for idx, fields in cached[1][:top_k]]
+        
+        distances, indices = self.index.search(query_embedding, top_k)
+        
+        # Cosine similarity as-is; older L2 indices convert distance to similarity.
+        # Done on the whole row at once; tolist() yields plain Python ints/floats
+        scores = distances[0] if self._is_cosine else 1.0 / (1.0 + distances[0])
+        ids = indices[0].tolist()
+        
+        # One lookup for all hits; FAISS pads missing hits with -1
+        rows = self.metadata.get_many(idx for idx in ids if idx >= 0)
         
         results = []
-        for idx, dist in zip(indices[0], distances[0]):
-            if idx < len(self.metadata):
-                result = self.metadata[idx].copy()
-                result['score'] = float(1 / (1 + dist))  # Convert distance to similarity
-                results.append(result)
+        for idx, score in zip(ids, scores.tolist()):
+            fields = rows.get(idx)
+            if fields is not None:
+                fields['score'] = score
+                results.append(VectorHit(idx, fields, self.texts))
         
+        if use_semantic_cache:
+            # Copies taken before callers add to or resolve the hits' fields
+            self.semantic_cache.put(
+                query_embedding[0], (top_k, [(hit.id, dict(hit._fields)) for hit in results])
+            )
         return results
     
+    def _encode_query(self, query: str, normalize: bool) -> np.ndarray:
+        if self.embedding_cache is None:
+            embedding = self.model.encode([query], convert_to_numpy=True, normalize_embeddings=normalize)
+        else:
+            # Behind the in-memory LRU: a query seen before a restart skips the model
+            self.load_model()  # Resolves the backend recorded in _cache_model_key
+            model_key = f"{self._cache_model_key}|normalize={normalize}"
+            text_hash = EmbeddingCache.text_hash(query)
+            embedding = self.embedding_cache.get_many([text_hash], model_key).get(text_hash)
+            if embedding is None:
+                embedding = self.model.encode([query], convert_to_numpy=True, normalize_embeddings=normalize)
+                self.embedding_cache.put_many([text_hash], embedding, model_key)
+        embedding = np.ascontiguousarray(embedding, dtype=np.float32).reshape(1, -1)
+        embedding.flags.writeable = False  # Shared by every search for this query
+        return embedding
+    
+    @property
+    def _is_cosine(self) -> bool:
+        # Indices saved before the switch to inner product are still L2
+        return self.index.metric_type == faiss.METRIC_INNER_PRODUCT
+    
+    def _base_index(self) -> faiss.Index:
+        """The index doing the search, unwrapped from its id map."""
+        if isinstance(self.index, faiss.IndexIDMap):
+            return faiss.downcast_index(self.index.index)
+        return self.index
+    
+    def _set_search_params(self):
+        """Apply the search-time knobs that match the index's type."""
+        base = self._base_index()
+        if isinstance(base, faiss.IndexRefine):
+            base.k_factor = self.refine_k_factor
+            base = faiss.downcast_index(base.base_index)
+        if isinstance(base, faiss.IndexHNSW):
+            base.hnsw.efSearch = self.ef_search
+        try:
+            faiss.extract_index_ivf(self.index).nprobe = self.nprobe
+        except RuntimeError:
+            pass  # Not an IVF index
+    
+    def flush(self, path: str):
+        """
+        Add the buffered embeddings to the index (unless it still awaits
+        training data) and write the metadata and texts of the chunks added
+        so far to ``path``, so none are held in memory until ``save``, which
+        writes the index.
+        """
+        self._check_writable()
+        if self.index.is_trained:
+            self._flush_pending()
+        self.metadata.save(path)
+        self.texts.save(path)
+    
     def save(self, path: str):
         """Save index and metadata."""
-        faiss.write_index(self.index, f"{path}/faiss.index")
-        with open(f"{path}/metadata.pkl", 'wb') as f:
-            pickle.dump(self.metadata, f)
+        self._check_writable()
+        self._flush_pending()
+        # Replace rather than overwrite: a read-only load may have the file mapped
+        faiss.write_index(self._cpu_index(), f"{path}/faiss.index.tmp")
+        os.replace(f"{path}/faiss.index.tmp", f"{path}/faiss.index")
+        self.metadata.save(path)
+        self.texts.save(path)
+    
+    def _to_gpu(self, index: faiss.Index) -> faiss.Index:
+        """Clone ``index`` onto the GPU if requested and possible, else return it as is."""
+        if not self.use_gpu:
+            return index
+        if not hasattr(faiss, "StandardGpuResources") or faiss.get_num_gpus() == 0:
+            logger.warning("use_gpu is set but FAISS has no GPU available; using the CPU index")
+            return index
+        if self._gpu_resources is None:
+            self._gpu_resources = faiss.StandardGpuResources()
+        options = faiss.GpuClonerOptions()
+        options.usePrecomputed = True   # IVFPQ: precomputed distance tables
+        try:
+            # Search params set on the CPU index (nprobe) carry over in the clone
+            gpu_index = faiss.index_cpu_to_gpu(self._gpu_resources, 0, index, options)
+        except RuntimeError as e:
+            # No GPU implementation for this type, e.g. HNSW
+            logger.warning(f"FAISS index can't run on the GPU, using the CPU index: {e}")
+            return index
+        self._on_gpu = True
+        return gpu_index
     
-    def load(self, path: str):
-        """Load index and metadata."""
-        self.index = faiss.read_index(f"{path}/faiss.index")
+    def _cpu_index(self) -> faiss.Index:
+        """The index as a CPU index, as write_index requires."""
+        return faiss.index_gpu_to_cpu(self.index) if self._on_gpu else self.index
+    
+    def _check_writable(self):
+        if self._read_only:
+            # Mapped inverted lists can't grow, nor be written as a standalone file
+            raise RuntimeError("Vector store was loaded read-only; load it with read_only=False to modify it")
+    
+    def load(self, path: str, read_only: bool = False):
+        """
+        Load index and metadata.
+        
+        Args:
+            path: Index directory written by ``save``
+            read_only: Serve queries only. IVF inverted lists are then
+                       memory-mapped and paged in per probed cluster instead
+                       of read into RAM, and the metadata database is opened
+                       read-only; chunks can no longer be added.
+        """
+        # The file records the index's full structure, so whatever type it
+        # was built with is reconstructed regardless of self.index_type
+        io_flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if read_only else 0
+        self.index = faiss.read_index(f"{path}/faiss.index", io_flags)
+        self._on_gpu = False
+        self._read_only = read_only
+        self._set_search_params()
+        self.index = self._to_gpu(self.index)
+        
+        self.metadata = ChunkMetaStore()
+        self.texts = ChunkTextStore()
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
+        if ChunkMetaStore.exists(path):
+            self.metadata.load(path, read_only=read_only)
+            self.texts.load(path)
+            return
+        
+        # Older index with metadata, text included, pickled as a list of
+        # dicts; kept in memory as pending rows until the index is saved again
         with open(f"{path}/metadata.pkl", 'rb') as f:
-            self.metadata = pickle.load(f)
+            legacy = pickle.load(f)
+        for meta in legacy:
+            self.texts.append(meta.pop('text'))
+            self.metadata.append(ChunkMetaStore.encode(meta))
@@ -1,6 +1,9 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import os
 from pathlib import Path
+import shutil
 import sys
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import uuid
 from tqdm import tqdm
 from loguru import logger
@@ -9,21 +12,38 @@ from loguru import logger
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from config.settings import Settings
-from ingestion.simple_pdf_loader import SimplePDFLoader
+from ingestion.simple_pdf_loader import SimplePDFLoader, process_pdf
 from indexing.vector_store import VectorStore
 from indexing.keyword_index import KeywordIndex
-from core.chunker import LegalChunk
+from indexing.embedding_cache import EmbeddingCache
+from core.chunker import LegalChunk, format_chunk
+from core.tokens import count_tokens
 
 class IndexBuilder:
     """Builds FAISS indices from PDF Documents."""
     
     def __init__(self, settings: Settings):
         self.settings = settings
-        self.vector_store = VectorStore(embedding_model=settings.embedding_model)
+        self.index_dir = Path(settings.index_dir)
+        # Built here and swapped in when complete, so a build that fails or
+        # is still running never mixes its files with the served index's
+        self.build_dir = self.index_dir.with_name(self.index_dir.name + ".building")
+        self.vector_store = VectorStore(
+            embedding_model=settings.embedding_model,
+            backend=settings.embedding_backend,
+            model_file=settings.embedding_model_file,
+            hnsw_m=settings.hnsw_m,
+            ef_construction=settings.hnsw_ef_construction,
+            ef_search=settings.hnsw_ef_search,
+            index_type=settings.vector_index_type,
+            nprobe=settings.ivf_nprobe,
+            device=settings.embedding_device,
+            use_gpu=settings.faiss_use_gpu,
+            encode_batch_size=settings.encode_batch_size,
+            embedding_cache=EmbeddingCache(settings.chunk_embedding_cache_path),
+        )
         self.keyword_index = KeywordIndex()
         self.pdf_dir = Path("data/pdfs") # Default, could be configurable
-        self.index_dir = Path(settings.index_dir)
-        self.index_dir.mkdir(parents=True, exist_ok=True)
 
     def build_all(self, laws: Optional[List[str]] = None):
         """
@@ -38,43 +58,76 @@ class IndexBuilder:
         loader_output = Path(self.settings.processed_data_dir)
         loader = SimplePDFLoader(self.pdf_dir, loader_output)
         
-        logger.info("Loading PDFs...")
-        documents = loader.load_all_pdfs()
-        
-        if not documents:
+        pdf_paths = loader.pdf_paths(laws)
+        if not pdf_paths:
             logger.warning("No PDF documents found to index.")
             return
 
-        all_chunks = []
+        total_chunks = 0
+        # Left over from an interrupted build
+        shutil.rmtree(self.build_dir, ignore_errors=True)
+        self.build_dir.mkdir(parents=True)
         
-        logger.info(f"Processing {len(documents)} documents...")
-        for law_code, doc_data in documents.items():
-            if laws and law_code not in laws:
-                continue
-                
-            logger.info(f"Chunking {law_code}...")
-            chunks = self._create_chunks(doc_data)
-            all_chunks.extend(chunks)
-            logger.info(f"Generated {len(chunks)} chunks for {law_code}")
+        # Parsing and chunking are CPU-bound and independent per PDF, so each
+        # runs in its own process; only the finished chunks come back.
+        # Each law's chunks go straight into both indices (concurrently:
+        # embedding releases the GIL), whose chunk stores are then flushed
+        # to disk, so neither the chunks nor their rows pile up across laws.
+        logger.info(f"Loading and chunking {len(pdf_paths)} PDFs...")
+        workers = min(len(pdf_paths), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool, ThreadPoolExecutor(max_workers=2) as index_pool:
+            # Taken in completion order so one large PDF doesn't hold up the
+            # laws that finish behind it. The futures are not kept in a local:
+            # as_completed drops each one (and its chunks) once yielded
+            for done in as_completed([pool.submit(_load_and_chunk, p) for p in pdf_paths]):
+                law_code, chunks = done.result()
+                logger.info(f"Generated {len(chunks)} chunks for {law_code}")
+                if not chunks:
+                    continue
+                futures = [
+                    index_pool.submit(self._add_and_flush, index, chunks)
+                    for index in (self.vector_store, self.keyword_index)
+                ]
+                for future in futures:
+                    future.result()
+                total_chunks += len(chunks)
 
-        if not all_chunks:
+        if not total_chunks:
             logger.warning("No chunks generated.")
+            shutil.rmtree(self.build_dir)
             return
-
-        logger.info(f"Building vector index with {len(all_chunks)} total chunks...")
-        self.vector_store.add_chunks(all_chunks)
-        self.keyword_index.add_chunks(all_chunks)
+        logger.info(f"Indexed {total_chunks} total chunks")
         
         logger.info(f"Saving index to {self.index_dir}...")
-        self.vector_store.save(str(self.index_dir))
-        self.keyword_index.save(str(self.index_dir))
+        self.vector_store.save(str(self.build_dir))
+        self.keyword_index.save(str(self.build_dir))
+        self._publish()
         logger.success("Index build complete!")
 
-    def _create_chunks(self, doc_data: dict) -> List[LegalChunk]:
+    def _add_and_flush(self, index, chunks: List[LegalChunk]):
+        index.add_chunks(chunks)
+        index.flush(str(self.build_dir))
+
+    def _publish(self):
+        """Replace index_dir with the finished build."""
+        # A directory can't be renamed over a non-empty one, so the old index
+        # is moved aside first; between the two renames index_dir is absent
+        # (a load then fails) but never half-built. Processes serving the old
+        # index keep their open and mapped files after it is deleted
+        old_dir = self.index_dir.with_name(self.index_dir.name + ".old")
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if self.index_dir.exists():
+            self.index_dir.rename(old_dir)
+        self.build_dir.rename(self.index_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    @staticmethod
+    def _create_chunks(doc_data: dict) -> List[LegalChunk]:
         """Convert document pages into LegalChunk objects."""
         chunks = []
         law_code = doc_data.get("law_code", "UNKNOWN")
         filename = doc_data.get("filename", "unknown.pdf")
+        total_pages = doc_data.get("total_pages")
         
         # Simple chunking by page for now
         # In a real system, we'd want more sophisticated text splitting
@@ -82,25 +135,42 @@ class IndexBuilder:
             page_text = page.get("text", "").strip()
             if not page_text:
                 continue
+            page_number = page.get("page_number")
                 
             # Create a chunk for the page
-            chunk = LegalChunk(
+            fields = dict(
                 law_code=law_code,
                 law_name=filename, # Use filename as law name for now
                 identifier_type="Page",
-                identifier_number=str(page.get("page_number")),
+                identifier_number=str(page_number),
                 text=page_text,
                 chunk_id=str(uuid.uuid4()),
-                page_number=page.get("page_number"),
+                page_number=page_number,
                 metadata={
                     "filename": filename,
-                    "total_pages": doc_data.get("total_pages")
+                    "total_pages": total_pages
                 }
             )
+            # Counted once here so build_context needs no tokenizer per query
+            fields["token_count"] = count_tokens(format_chunk({"source_url": None, **fields}))
+            chunk = LegalChunk(**fields)
             chunks.append(chunk)
             
         return chunks
 
+def _load_and_chunk(pdf_path: Path) -> Tuple[str, List[LegalChunk]]:
+    """Parse and chunk one PDF; runs in a worker process."""
+    law_code = pdf_path.stem
+    try:
+        doc_data = process_pdf(pdf_path)
+        if not doc_data:
+            return law_code, []
+        doc_data["law_code"] = law_code
+        return law_code, IndexBuilder._create_chunks(doc_data)
+    except Exception as e:
+        logger.error(f"Failed to process {pdf_path}: {e}")
+        return law_code, []
+
 if __name__ == "__main__":
     # Support running this file directly
     settings = Settings()
@@ -16,7 +16,7 @@ from loguru import logger
 if __name__ == "__main__":
     sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from ingestion.simple_pdf_loader import SimplePDFLoader
+from ingestion.simple_pdf_loader import SimplePDFLoader, full_text
 
 
 
@@ -33,6 +33,11 @@ class LegalDocumentDB:
     def _init_database(self):
         """Initialize database and create tables."""
         self.conn = sqlite3.connect(str(self.db_path))
+        # WAL + NORMAL sync: commits append to the log instead of fsyncing
+        # the database file each time
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
         cursor = self.conn.cursor()
         
         # Create documents table
@@ -58,6 +63,40 @@ class LegalDocumentDB:
                 FOREIGN KEY (document_id) REFERENCES documents(id)
             )
         """)
+        # Backs the pages -> documents join and per-document page lookups
+        # (its document_id prefix serves queries on document_id alone).
+        # documents.law_code is already indexed by its UNIQUE constraint
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pages_doc_page
+            ON pages (document_id, page_number)
+        """)
+        
+        # Full-text index over page text (external content: the text itself
+        # stays in pages), kept in sync by triggers
+        fts_exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pages_fts'"
+        ).fetchone()
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
+                text, content='pages', content_rowid='id',
+                tokenize='porter unicode61'
+            )
+        """)
+        cursor.executescript("""
+            CREATE TRIGGER IF NOT EXISTS pages_fts_insert AFTER INSERT ON pages BEGIN
+                INSERT INTO pages_fts(rowid, text) VALUES (new.id, new.text);
+            END;
+            CREATE TRIGGER IF NOT EXISTS pages_fts_delete AFTER DELETE ON pages BEGIN
+                INSERT INTO pages_fts(pages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+            END;
+            CREATE TRIGGER IF NOT EXISTS pages_fts_update AFTER UPDATE ON pages BEGIN
+                INSERT INTO pages_fts(pages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+                INSERT INTO pages_fts(rowid, text) VALUES (new.id, new.text);
+            END;
+        """)
+        if not fts_exists:
+            # Database created before the index: index the existing pages
+            cursor.execute("INSERT INTO pages_fts(pages_fts) VALUES ('rebuild')")
         
         self.conn.commit()
         logger.info(f"Database initialized: {self.db_path}")
@@ -69,6 +108,12 @@ class LegalDocumentDB:
         Args:
             doc_data: Document dictionary from SimplePDFLoader
         """
+        self._insert_document(doc_data)
+        self.conn.commit()
+        logger.info(f"✓ Inserted {doc_data['law_code']} into database")
+    
+    def _insert_document(self, doc_data: dict):
+        """Insert a document and its pages without committing."""
         cursor = self.conn.cursor()
         
         # Insert main document
@@ -80,33 +125,41 @@ class LegalDocumentDB:
             doc_data["law_code"],
             doc_data["filename"],
             doc_data["total_pages"],
-            doc_data["full_text"],
+            full_text(doc_data),
             doc_data["metadata"]["file_size_bytes"]
         ))
         
         document_id = cursor.lastrowid
         
         # Insert pages
-        for page in doc_data["pages"]:
-            cursor.execute("""
-                INSERT INTO pages (document_id, page_number, text)
-                VALUES (?, ?, ?)
-            """, (
-                document_id,
-                page["page_number"],
-                page["text"]
-            ))
-        
-        self.conn.commit()
-        logger.info(f"✓ Inserted {doc_data['law_code']} into database")
+        cursor.executemany("""
+            INSERT INTO pages (document_id, page_number, text)
+            VALUES (?, ?, ?)
+        """, [
+            (document_id, page["page_number"], page["text"])
+            for page in doc_data["pages"]
+        ])
     
     def insert_all(self, documents: Dict[str, dict]):
-        """Insert all documents."""
-        for law_code, doc_data in documents.items():
-            try:
-                self.insert_document(doc_data)
-            except Exception as e:
-                logger.error(f"Failed to insert {law_code}: {e}")
+        """Insert all documents in a single transaction."""
+        self.conn.execute("BEGIN")
+        try:
+            for law_code, doc_data in documents.items():
+                # A savepoint per document: a failed one is undone on its own
+                # without losing the others
+                self.conn.execute("SAVEPOINT document")
+                try:
+                    self._insert_document(doc_data)
+                except Exception as e:
+                    self.conn.execute("ROLLBACK TO document")
+                    logger.error(f"Failed to insert {law_code}: {e}")
+                else:
+                    logger.info(f"✓ Inserted {law_code} into database")
+                self.conn.execute("RELEASE document")
+        except BaseException:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
     
     def get_document(self, law_code: str) -> dict:
         """Retrieve a document by law code."""
@@ -142,31 +195,33 @@ class LegalDocumentDB:
     
     def search_text(self, query: str, law_code: str = None) -> List[dict]:
         """
-        Simple text search in documents.
+        Full-text search over pages, best BM25 match first.
         
         Args:
-            query: Search query
+            query: Search query, matched as a phrase
             law_code: Optional law code to search within
         """
         cursor = self.conn.cursor()
         
+        # Quoted as one FTS5 phrase so punctuation in the query is literal
+        # text rather than query syntax
+        phrase = '"' + query.replace('"', '""') + '"'
+        
+        sql = """
+            SELECT d.law_code, p.page_number, snippet(pages_fts, 0, '', '', '...', 32)
+            FROM pages_fts
+            JOIN pages p ON pages_fts.rowid = p.id
+            JOIN documents d ON p.document_id = d.id
+            WHERE pages_fts MATCH ?
+        """
+        params = [phrase]
         if law_code:
-            cursor.execute("""
-                SELECT law_code, page_number, text 
-                FROM pages p
-                JOIN documents d ON p.document_id = d.id
-                WHERE d.law_code = ? AND p.text LIKE ?
-            """, (law_code, f"%{query}%"))
-        else:
-            cursor.execute("""
-                SELECT law_code, page_number, text 
-                FROM pages p
-                JOIN documents d ON p.document_id = d.id
-                WHERE p.text LIKE ?
-            """, (f"%{query}%",))
+            sql += " AND d.law_code = ?"
+            params.append(law_code)
+        cursor.execute(sql + " ORDER BY pages_fts.rank", params)
         
         return [
-            {"law_code": row[0], "page": row[1], "text": row[2][:200]}
+            {"law_code": row[0], "page": row[1], "text": row[2]}
             for row in cursor.fetchall()
         ]
     
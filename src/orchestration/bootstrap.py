@@ -0,0 +1,140 @@
+# src/orchestration/bootstrap.py
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Tuple
+
+from config.runtime import configure_threads
+from config.settings import Settings
+from core.intent_classifier import IntentClassifier
+from core.retriever import HybridRetriever
+from core.reranker import LegalReranker
+from core.llm_handler import BatchingLLMHandler, LegalLLMHandler
+from indexing.vector_store import VectorStore
+from indexing.embedding_cache import EmbeddingCache
+from indexing.keyword_index import KeywordIndex
+from indexing.semantic_cache import SemanticCache
+from validation.answer_validator import AnswerValidator
+from orchestration.workflow import LegalRAGWorkflow
+
+# Process-wide singleton. This lives in an imported module (not the Streamlit
+# script, which is re-executed on every rerun) so it survives reruns.
+_SYSTEM: Optional[Tuple[LegalRAGWorkflow, Settings]] = None
+_LOCK = threading.Lock()
+
+
+def load_system() -> Tuple[LegalRAGWorkflow, Settings]:
+    """Load all system components once per process and return them."""
+    global _SYSTEM
+    if _SYSTEM is None:
+        with _LOCK:
+            if _SYSTEM is None:
+                _SYSTEM = _build_system()
+    return _SYSTEM
+
+
+def _build_system() -> Tuple[LegalRAGWorkflow, Settings]:
+    settings = Settings()
+    configure_threads(settings.num_threads)
+
+    # Load indices
+    index_dir = Path(settings.index_dir)
+    if not (index_dir / "faiss.index").exists():
+        raise FileNotFoundError(f"FAISS index not found at {index_dir}. Please run the ingestion script first.")
+
+    # Use key from settings, fallback to env if needed, but settings handles .env loading
+    api_key = settings.groq_api_key or os.getenv("GROQ_API_KEY")
+    if not api_key:
+        raise ValueError("GROQ_API_KEY not found in settings or environment")
+
+    # The index reads and model loads are independent and spend most of their
+    # time in file I/O and native code, so overlap them to cut cold start.
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        vector_future = pool.submit(_load_vector_store, settings)
+        keyword_future = pool.submit(_load_keyword_index, settings)
+        reranker_future = pool.submit(_load_reranker, settings)
+        vector_store = vector_future.result()
+        keyword_index = keyword_future.result()
+        reranker = reranker_future.result()
+
+    _warm_up(vector_store, keyword_index, reranker)
+
+    # Initialize components
+    intent_classifier = IntentClassifier()
+    retriever = HybridRetriever(vector_store, keyword_index)
+
+    llm_handler = LegalLLMHandler(api_key, model="openai/gpt-oss-120b") # Using a valid Groq model name
+    if settings.llm_batch_size > 1:
+        llm_handler = BatchingLLMHandler(
+            llm_handler,
+            max_batch_size=settings.llm_batch_size,
+            window_ms=settings.llm_batch_window_ms,
+        )
+
+    validator = AnswerValidator()
+
+    # Build workflow
+    workflow = LegalRAGWorkflow(
+        intent_classifier,
+        retriever,
+        reranker,
+        llm_handler,
+        validator
+    )
+
+    return workflow, settings
+
+
+def _warm_up(vector_store: VectorStore, keyword_index: KeywordIndex, reranker: LegalReranker):
+    """
+    Run one throwaway query through the local models and indices so the
+    first real query does not pay for lazy kernel/session initialisation.
+    The LLM is not called; it is a remote API with nothing to warm.
+    """
+    query = "punishment for theft"
+    candidates = vector_store.search(query, top_k=1) + keyword_index.search(query, top_k=1)
+    reranker.rerank(query, candidates, top_k=1)
+
+
+def _load_vector_store(settings: Settings) -> VectorStore:
+    vector_store = VectorStore(
+        settings.embedding_model,
+        backend=settings.embedding_backend,
+        model_file=settings.embedding_model_file,
+        ef_search=settings.hnsw_ef_search,
+        nprobe=settings.ivf_nprobe,
+        refine_k_factor=settings.refine_k_factor,
+        device=settings.embedding_device,
+        use_gpu=settings.faiss_use_gpu,
+        embedding_cache=(
+            EmbeddingCache(settings.query_embedding_cache_path)
+            if settings.query_embedding_cache_path else None
+        ),
+        semantic_cache=(
+            SemanticCache(settings.semantic_cache_threshold, settings.semantic_cache_size)
+            if settings.semantic_cache_threshold is not None else None
+        ),
+    )
+    vector_store.load(settings.index_dir, read_only=True)
+    # Loaded here, in parallel with the other components, rather than by
+    # the first query
+    vector_store.load_model()
+    return vector_store
+
+
+def _load_keyword_index(settings: Settings) -> KeywordIndex:
+    keyword_index = KeywordIndex()
+    keyword_index.load(settings.index_dir)
+    return keyword_index
+
+
+def _load_reranker(settings: Settings) -> LegalReranker:
+    return LegalReranker(
+        settings.reranker_model,
+        backend=settings.reranker_backend,
+        model_file=settings.reranker_model_file,
+        max_length=settings.reranker_max_length,
+    )
@@ -1,8 +1,11 @@
 # src/orchestration/workflow.py
 from __future__ import annotations
 
-from typing import Dict, Any, TYPE_CHECKING
+import asyncio
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional, TypedDict, TYPE_CHECKING
 from loguru import logger 
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 
 if TYPE_CHECKING:
@@ -12,6 +15,23 @@ if TYPE_CHECKING:
     from core.llm_handler import LegalLLMHandler
     from validation.answer_validator import AnswerValidator
 
+SMALL_TALK_REPLY = (
+    "Hello! I answer questions about Indian statutes. "
+    "Try, for example: What is the punishment for theft?"
+)
+
+class WorkflowState(TypedDict, total=False):
+    """Graph state; each node returns only the keys it produces."""
+    query: str
+    intent: Dict[str, Any]
+    candidates: List[Dict]
+    final_chunks: List[Dict]
+    context: str
+    answer: str
+    validation: Dict[str, Any]
+    error: str
+
+
 class LegalRAGWorkflow:
     """LangGraph-based orchestration workflow."""
     
@@ -28,16 +48,23 @@ class LegalRAGWorkflow:
         self.llm_handler = llm_handler
         self.validator = validator
         
+        # Repeated queries skip classification and retrieval. The indices are
+        # read-only while serving, so entries never go stale
+        self._classify = lru_cache(maxsize=1024)(intent_classifier.classify)
+        self._retrieve = lru_cache(maxsize=256)(self._retrieve_uncached)
+        
         self.graph = self._build_graph()
     
     def _build_graph(self) -> StateGraph:
         """Build LangGraph workflow."""
         
-        workflow = StateGraph(dict)
+        workflow = StateGraph(WorkflowState)
 
         
-        # Define nodes
-        workflow.add_node("classify_intent", self._classify_intent_node)
+        # Define nodes. Under ainvoke, classification overlaps a speculative retrieval
+        workflow.add_node("classify_intent", RunnableLambda(
+            self._classify_intent_node, afunc=self._aclassify_intent_node
+        ))
         workflow.add_node("retrieve", self._retrieve_node)
         workflow.add_node("rerank", self._rerank_node)
         workflow.add_node("generate", self._generate_node)
@@ -45,7 +72,11 @@ class LegalRAGWorkflow:
         
         # Define edges
         workflow.set_entry_point("classify_intent")
-        workflow.add_edge("classify_intent", "retrieve")
+        workflow.add_conditional_edges(
+            "classify_intent",
+            self._route_after_intent,
+            {"retrieve": "retrieve", "end": END}
+        )
         workflow.add_edge("retrieve", "rerank")
         workflow.add_edge("rerank", "generate")
         workflow.add_edge("generate", END)
@@ -56,74 +87,140 @@ class LegalRAGWorkflow:
     def _classify_intent_node(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Intent classification node."""
         try:
-            logger.info(f"Classifying query: {state['query']}")
-            intent = self.intent_classifier.classify(state['query'])
-            state['intent'] = intent.model_dump()
-            logger.info(f"Detected domain: {intent.domain}, law: {intent.law_type}")
+            logger.info("Classifying query: {}", state['query'])
+            if not self.intent_classifier.needs_retrieval(state['query']):
+                logger.info("Small talk; skipping retrieval and generation")
+                return {'answer': SMALL_TALK_REPLY}
+            intent = self._classify(state['query'])
+            logger.info("Detected domain: {}, law: {}", intent.domain, intent.law_type)
+            return {'intent': intent.model_dump()}
         except Exception as e:
             logger.error(f"Intent classification error: {e}")
-            state['error'] = str(e)
-        return state
+            return {'error': str(e)}
+    
+    async def _aclassify_intent_node(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Intent classification node for ``ainvoke``: retrieval starts while
+        the intent is classified, so its latency overlaps classification;
+        for small talk its result is simply discarded.
+        """
+        loop = asyncio.get_running_loop()
+        retrieval = loop.run_in_executor(None, self._retrieve_node, state)
+        update = await loop.run_in_executor(None, self._classify_intent_node, state)
+        if self._route_after_intent(update) == "end":
+            return update
+        return {**await retrieval, **update}
+    
+    @staticmethod
+    def _route_after_intent(state: Dict[str, Any]) -> str:
+        """End early when the classify node already answered the query."""
+        return "end" if state.get('answer') else "retrieve"
     
     def _retrieve_node(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Hybrid retrieval node."""
+        if 'candidates' in state:
+            return {}  # Retrieved speculatively by the classify node
         try:
-            logger.info("Retrieving relevant chunks")
-            candidates = self.retriever.retrieve(state['query'], top_k=15)
-            state['candidates'] = candidates
-            logger.info(f"Retrieved {len(candidates)} candidates")
+            logger.debug("Retrieving relevant chunks")
+            # Copied: reranking adds scores to, and reorders, the candidates
+            candidates = [dict(c) for c in self._retrieve(state['query'], 15)]
+            logger.info("Retrieved {} candidates", len(candidates))
+            return {'candidates': candidates}
         except Exception as e:
             logger.error(f"Retrieval error: {e}")
-            state['error'] = str(e)
-        return state
+            return {'error': str(e)}
+    
+    def _retrieve_uncached(self, query: str, top_k: int) -> tuple:
+        return tuple(self.retriever.retrieve(query, top_k=top_k))
     
     def _rerank_node(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Reranking node."""
         try:
-            logger.info("Reranking candidates")
+            logger.debug("Reranking candidates")
             reranked = self.reranker.rerank(
                 state['query'], 
                 state['candidates'], 
                 top_k=5
             )
-            state['final_chunks'] = reranked
-            logger.info(f"Reranked to {len(reranked)} chunks")
+            logger.info("Reranked to {} chunks", len(reranked))
+            return {'final_chunks': reranked}
         except Exception as e:
             logger.error(f"Reranking error: {e}")
-            state['error'] = str(e)
-        return state
+            return {'error': str(e)}
     
     def _generate_node(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """LLM generation node."""
         try:
-            logger.info("Generating answer")
+            logger.debug("Generating answer")
             context = self.llm_handler.build_context(state['final_chunks'])
             answer = self.llm_handler.generate_answer(state['query'], context)
-            state['answer'] = answer
-            state['context'] = context
             logger.info("Answer generated")
+            return {'answer': answer, 'context': context}
         except Exception as e:
             logger.error(f"Generation error: {e}")
-            state['error'] = str(e)
-        return state
+            return {'error': str(e)}
     
     def _validate_node(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Validation node."""
         try:
-            logger.info("Validating answer")
+            logger.debug("Validating answer")
             validation = self.validator.validate(
                 state['answer'], 
                 state['final_chunks']
             )
-            state['validation'] = validation
-            logger.info(f"Validation: {validation['valid']}, Confidence: {validation['confidence']}")
+            logger.info("Validation: {}, Confidence: {}", validation['valid'], validation['confidence'])
+            return {'validation': validation}
         except Exception as e:
             logger.error(f"Validation error: {e}")
-            state['error'] = str(e)
-        return state
+            return {'error': str(e)}
     
     def run(self, query: str) -> Dict[str, Any]:
         """Execute workflow."""
-        initial_state = {"query": query}
+        initial_state: WorkflowState = {"query": query}
         final_state = self.graph.invoke(initial_state)
-        return final_state
\ No newline at end of file
+        return final_state
+    
+    async def arun(self, query: str) -> Dict[str, Any]:
+        """
+        Execute workflow without blocking the event loop; returns the same
+        state as ``run``, with retrieval overlapping intent classification.
+        """
+        initial_state: WorkflowState = {"query": query}
+        return await self.graph.ainvoke(initial_state)
+    
+    def stream(self, query: str, state: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        Execute workflow, yielding answer text as the LLM generates it.
+        
+        Args:
+            query: User query
+            state: Optional dict that is filled with the same keys ``run``
+                   returns; ``answer`` is set once the stream is exhausted.
+        """
+        if state is None:
+            state = {}
+        state['query'] = query
+        
+        state.update(self._classify_intent_node(state))
+        if self._route_after_intent(state) == "end":
+            yield state['answer']
+            return
+        
+        for node in (self._retrieve_node, self._rerank_node):
+            state.update(node(state))
+        if state.get('error'):
+            return
+        
+        try:
+            logger.debug("Streaming answer")
+            context = self.llm_handler.build_context(state['final_chunks'])
+            state['context'] = context
+            parts = []
+            for text in self.llm_handler.stream_answer(query, context):
+                parts.append(text)
+                yield text
+            state['answer'] = "".join(parts)
+            logger.info("Answer generated")
+        except Exception as e:
+            logger.error(f"Generation error: {e}")
+            state['error'] = str(e)
@@ -2,12 +2,49 @@
 import re
 from typing import List, Dict        
 
+REQUIRED_SECTIONS = ("Legal Position:", "Relevant Provisions:", "Disclaimer:")
+
+SPECULATIVE_PHRASES = (
+    "i think", "probably", "maybe", "might be",
+    "could be interpreted", "in my opinion"
+)
+
+# Citations, section headers and speculative language, found in one scan of
+# the answer (alternatives in order of how often answers contain them; no two
+# can overlap). Speculative phrases match case-insensitively, the rest do not,
+# each in its own group (spec0, spec1, ...) so a match is identified by group
+# rather than by lowercasing its text: "İ think".lower() is not "i think".
+# Citation numbers are ASCII digits, so \d skips the Unicode category test;
+# \s stays Unicode-aware, so a no-break space still separates "Section" from
+# its number
+_MARKERS_RE = re.compile(
+    r'(?P<cite>(?:Article|Section)\s+(?a:\d)+)'
+    r'|(?P<sec>' + '|'.join(map(re.escape, REQUIRED_SECTIONS)) + r')'
+    r'|(?i:' + '|'.join(
+        f'(?P<spec{i}>{re.escape(phrase)})' for i, phrase in enumerate(SPECULATIVE_PHRASES)
+    ) + r')'
+)
+# The same pattern over bytes, for ASCII answers: SRE's byte matcher skips
+# the Unicode character-class lookups. On ASCII text the two match alike
+_MARKERS_BYTES_RE = re.compile(_MARKERS_RE.pattern.encode("ascii"))
+# Searched on its own: in the scan above, \S+ would consume a header or
+# citation written right after a URL ("https://x/Disclaimer:"). A no-break
+# space still ends a URL
+_URL_RE = re.compile(r'https?://\S+')
+_URL_BYTES_RE = re.compile(_URL_RE.pattern.encode("ascii"))
+
 class AnswerValidator:
     """Validates LLM answers for legal compliance."""
     
     @staticmethod
-    def validate(answer: str, retrieved_chunks: List[Dict]) -> Dict:
-        """Validate answer structure and citations."""
+    def validate(answer: str, retrieved_chunks: List[Dict], fast: bool = False) -> Dict:
+        """
+        Validate answer structure and citations.
+        
+        With ``fast=True`` the result is returned at the first error, for
+        callers that only need ``valid``; errors, warnings and confidence
+        are then incomplete.
+        """
         
         validation_result = {
             "valid": True,
@@ -16,41 +53,57 @@ class AnswerValidator:
             "confidence": "high"
         }
         
+        has_citations = False
+        found_sections = set()
+        speculative_found = set()
+        if answer.isascii():
+            data = answer.encode("ascii")
+            matches = _MARKERS_BYTES_RE.finditer(data)
+            has_urls = _URL_BYTES_RE.search(data) is not None
+        else:
+            matches = _MARKERS_RE.finditer(answer)
+            has_urls = _URL_RE.search(answer) is not None
+        for match in matches:
+            if match.lastgroup == "cite":
+                has_citations = True
+            elif match.lastgroup == "sec":
+                # Sliced from answer: offsets agree in both modes, and this is a str
+                found_sections.add(answer[match.start():match.end()])
+            else:
+                speculative_found.add(SPECULATIVE_PHRASES[int(match.lastgroup[4:])])
+        
         # Check for required sections
-        required_sections = ["Legal Position:", "Relevant Provisions:", "Disclaimer:"]
-        for section in required_sections:
-            if section not in answer:
+        for section in REQUIRED_SECTIONS:
+            if section not in found_sections:
                 validation_result["valid"] = False
                 validation_result["errors"].append(f"Missing required section: {section}")
+                if fast:
+                    return validation_result
         
         # Check for section/article citations
-        has_citations = bool(re.search(r'(Article|Section)\s+\d+', answer))
         if not has_citations:
             validation_result["valid"] = False
             validation_result["errors"].append("No Article/Section citations found")
+            if fast:
+                return validation_result
         
         # Check for source URLs
-        has_urls = bool(re.search(r'https?://\S+', answer))
         if not has_urls:
             validation_result["valid"] = False
             validation_result["errors"].append("No source URLs found")
+            if fast:
+                return validation_result
         
         # Check for speculative language
-        speculative_phrases = [
-            "i think", "probably", "maybe", "might be",
-            "could be interpreted", "in my opinion"
-        ]
-        answer_lower = answer.lower()
-        for phrase in speculative_phrases:
-            if phrase in answer_lower:
-                validation_result["warnings"].append(f"Speculative language detected: {phrase}")
-                validation_result["confidence"] = "medium"
-        
-        # Check if answer references provided chunks
-        chunk_ids_in_context = {c['chunk_id'] for c in retrieved_chunks}
-        referenced_sections = re.findall(r'(Article|Section)\s+(\d+[a-z]?)', answer)
-        
-        if not referenced_sections:
+        if speculative_found:
+            validation_result["warnings"].extend(
+                f"Speculative language detected: {phrase}"
+                for phrase in SPECULATIVE_PHRASES if phrase in speculative_found
+            )
+            validation_result["confidence"] = "medium"
+        
+        # Answers citing no Article/Section (found in the scan above) are low confidence
+        if not has_citations:
             validation_result["confidence"] = "low"
         
         return validation_result
@@ -0,0 +1,30 @@
+from validation.answer_validator import AnswerValidator
+
+ANSWER = (
+    "Legal Position: Theft is punishable under Section 303. {}\n"
+    "Relevant Provisions: Section 303, https://indiacode.nic.in/bns\n"
+    "Disclaimer: This is not legal advice."
+)
+
+
+def test_complete_answer_is_valid():
+    result = AnswerValidator.validate(ANSWER.format(""), [])
+    assert result == {"valid": True, "errors": [], "warnings": [], "confidence": "high"}
+
+
+def test_speculative_phrase_warns_regardless_of_case():
+    for sentence in ("I think so.", "MAYBE not.", "İ think so."):
+        result = AnswerValidator.validate(ANSWER.format(sentence), [])
+        assert result["confidence"] == "medium"
+        assert len(result["warnings"]) == 1
+        assert result["warnings"][0].startswith("Speculative language detected: ")
+
+
+def test_marker_right_after_url_is_found():
+    answer = (
+        "Legal Position: Theft is an offence.\n"
+        "Relevant Provisions: https://indiacode.nic.in/bns,Section 303\n"
+        "https://indiacode.nic.in/Disclaimer: This is not legal advice."
+    )
+    result = AnswerValidator.validate(answer, [])
+    assert result["valid"], result["errors"]
@@ -0,0 +1,65 @@
+from indexing.chunk_meta_store import ChunkMetaStore
+from indexing.chunk_store import ChunkTextStore
+
+
+def row(i: int) -> str:
+    return ChunkMetaStore.encode({"chunk_id": f"bns-{i}", "identifier_number": str(i)})
+
+
+def test_meta_store_round_trip(tmp_path):
+    store = ChunkMetaStore()
+    store.extend([row(0), row(1)])
+    assert store.get_many([1])[1]["chunk_id"] == "bns-1"  # Pending rows are readable
+    store.save(str(tmp_path))
+
+    # Saved back to the same file: the new rows are appended
+    store.append(row(2))
+    store.save(str(tmp_path))
+
+    loaded = ChunkMetaStore()
+    loaded.load(str(tmp_path), read_only=True)
+    assert len(loaded) == 3
+    found = loaded.get_many([2, 0, 7, -1])
+    assert sorted(found) == [0, 2]
+    assert found[2] == {"chunk_id": "bns-2", "identifier_number": "2"}
+
+
+def test_meta_store_saves_read_only_store_to_new_file(tmp_path):
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    store = ChunkMetaStore()
+    store.extend([row(0), row(1)])
+    store.save(str(first))
+
+    loaded = ChunkMetaStore()
+    loaded.load(str(first), read_only=True)
+    loaded.append(row(2))
+    loaded.save(str(second))
+    assert [loaded.get_many([i])[i]["chunk_id"] for i in range(3)] == ["bns-0", "bns-1", "bns-2"]
+    assert ChunkMetaStore.exists(str(second))
+
+
+def test_text_store_round_trip(tmp_path):
+    texts = ["Whoever commits theft", "चोरी का दंड", ""]
+    store = ChunkTextStore()
+    store.extend(texts[:2])
+    store.save(str(tmp_path))
+
+    # Saved back to the same directory: the new texts are appended
+    store.append(texts[2])
+    store.append("last")
+    store.save(str(tmp_path))
+
+    loaded = ChunkTextStore()
+    loaded.load(str(tmp_path))
+    assert len(loaded) == 4
+    assert [loaded.get(i) for i in range(4)] == texts + ["last"]
+    loaded.close()
+
+
+def test_text_store_empty(tmp_path):
+    ChunkTextStore().save(str(tmp_path))
+    loaded = ChunkTextStore()
+    loaded.load(str(tmp_path))
+    assert len(loaded) == 0
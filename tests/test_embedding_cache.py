@@ -0,0 +1,22 @@
+import numpy as np
+
+from indexing.embedding_cache import EmbeddingCache
+
+
+def test_round_trip_per_model(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache" / "embeddings.sqlite")
+    hashes = [EmbeddingCache.text_hash(text) for text in ("theft", "murder")]
+    vectors = np.arange(6, dtype=np.float64).reshape(2, 3)
+    cache.put_many(hashes, vectors, "model-a")
+
+    found = cache.get_many(hashes + hashes[:1] + ["missing"], "model-a")
+    assert sorted(found) == sorted(hashes)
+    assert found[hashes[1]].dtype == np.float32
+    np.testing.assert_array_equal(found[hashes[1]], [3, 4, 5])
+    assert cache.get_many(hashes, "model-b") == {}
+    cache.close()
+
+    # Persists across instances
+    reopened = EmbeddingCache(tmp_path / "cache" / "embeddings.sqlite")
+    np.testing.assert_array_equal(reopened.get_many(hashes[:1], "model-a")[hashes[0]], [0, 1, 2])
+    reopened.close()
@@ -0,0 +1,43 @@
+from core.chunker import LegalChunk
+from indexing.keyword_index import KeywordIndex
+
+
+def make_chunks(law_code: str, texts) -> list:
+    return [
+        LegalChunk(
+            law_code=law_code,
+            law_name=f"{law_code} Act",
+            identifier_type="Section",
+            identifier_number=str(i),
+            text=text,
+            chunk_id=f"{law_code}-{i}",
+        )
+        for i, text in enumerate(texts, start=1)
+    ]
+
+
+LAWS = [
+    make_chunks("BNS", ["theft of movable property", "punishment for murder"]),
+    make_chunks("BNSS", ["arrest without warrant", "bail in bailable offences"]),
+]
+
+
+def hits(index: KeywordIndex, query: str):
+    return [(hit["chunk_id"], hit["score"]) for hit in index.search(query, top_k=3)]
+
+
+def test_flushed_per_law_matches_single_add(tmp_path):
+    whole = KeywordIndex()
+    whole.add_chunks([chunk for law in LAWS for chunk in law])
+
+    streamed = KeywordIndex()
+    for law in LAWS:
+        streamed.add_chunks(law)
+        streamed.flush(str(tmp_path))
+    assert hits(streamed, "bail warrant") == hits(whole, "bail warrant")
+
+    streamed.save(str(tmp_path))
+    loaded = KeywordIndex()
+    loaded.load(str(tmp_path))
+    assert hits(loaded, "bail warrant") == hits(whole, "bail warrant")
+    assert loaded.search("murder", top_k=1)[0]["text"] == "punishment for murder"
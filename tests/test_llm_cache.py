@@ -0,0 +1,27 @@
+import pytest
+
+pytest.importorskip("diskcache")
+
+from core.llm import _cache
+from core.llm._cache import get_or_generate, stream_or_generate
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(_cache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(_cache, "_cache", None)
+    yield
+    if _cache._cache is not None:
+        _cache._cache.close()
+
+
+def test_stream_is_cached_whole():
+    assert list(stream_or_generate(("q",), lambda: iter(["Section ", "303"]))) == ["Section ", "303"]
+    assert list(stream_or_generate(("q",), lambda: iter(["other"]))) == ["Section 303"]
+    assert get_or_generate(("q",), lambda: "other") == "Section 303"
+
+
+def test_error_responses_are_not_cached():
+    assert get_or_generate(("q",), lambda: "Error: Unsupported provider").startswith("Error:")
+    assert list(stream_or_generate(("q",), lambda: iter(["Error: ", "timeout"]))) == ["Error: ", "timeout"]
+    assert get_or_generate(("q",), lambda: "answer") == "answer"
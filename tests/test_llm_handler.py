@@ -0,0 +1,67 @@
+import json
+import threading
+
+import pytest
+
+pytest.importorskip("anthropic")
+
+from core.llm_handler import BatchingLLMHandler
+
+
+class FakeHandler:
+    """Answers batches with a JSON array, or with ``batch_reply`` if set."""
+
+    def __init__(self, batch_reply=None):
+        self.batch_reply = batch_reply
+        self.batches = []
+        self.single = []
+
+    def complete(self, user_message, max_tokens=2000):
+        payload = user_message["content"].split("\n\n")[1]
+        queries = [item["query"] for item in json.loads(payload)]
+        self.batches.append(queries)
+        if self.batch_reply is not None:
+            return self.batch_reply
+        return "```json\n" + json.dumps([f"answer to {q}" for q in queries]) + "\n```"
+
+    def generate_answer(self, query, context):
+        self.single.append(query)
+        return f"single answer to {query}"
+
+
+def ask_concurrently(batcher, queries):
+    answers = {}
+
+    def ask(query):
+        answers[query] = batcher.generate_answer(query, f"context for {query}")
+
+    threads = [threading.Thread(target=ask, args=(q,)) for q in queries]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    return answers
+
+
+def test_concurrent_queries_share_one_request():
+    handler = FakeHandler()
+    batcher = BatchingLLMHandler(handler, max_batch_size=3, window_ms=5000)
+    answers = ask_concurrently(batcher, ["q1", "q2", "q3"])
+    assert answers == {q: f"answer to {q}" for q in ("q1", "q2", "q3")}
+    assert len(handler.batches) == 1 and sorted(handler.batches[0]) == ["q1", "q2", "q3"]
+    assert handler.single == []
+
+
+def test_lone_query_is_sent_after_window():
+    handler = FakeHandler()
+    batcher = BatchingLLMHandler(handler, max_batch_size=8, window_ms=10)
+    assert batcher.generate_answer("q1", "context") == "single answer to q1"
+    assert handler.batches == []
+
+
+def test_unparseable_batch_falls_back_to_single_requests():
+    handler = FakeHandler(batch_reply="not json")
+    batcher = BatchingLLMHandler(handler, max_batch_size=2, window_ms=5000)
+    answers = ask_concurrently(batcher, ["q1", "q2"])
+    assert answers == {q: f"single answer to {q}" for q in ("q1", "q2")}
+    assert sorted(handler.single) == ["q1", "q2"]
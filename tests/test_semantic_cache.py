@@ -0,0 +1,30 @@
+import numpy as np
+
+from indexing.semantic_cache import SemanticCache
+
+
+def unit(*values) -> np.ndarray:
+    v = np.asarray(values, dtype=np.float32)
+    return v / np.linalg.norm(v)
+
+
+def test_returns_value_of_similar_query():
+    cache = SemanticCache(threshold=0.95, size=4)
+    assert cache.get(unit(1, 0, 0)) is None
+    cache.put(unit(1, 0, 0), "theft")
+    cache.put(unit(0, 1, 0), "murder")
+    assert cache.get(unit(1, 0.1, 0)) == "theft"
+    assert cache.get(unit(1, 1, 0)) is None  # cos = 0.71
+    cache.clear()
+    assert cache.get(unit(1, 0, 0)) is None
+
+
+def test_evicts_least_recently_used():
+    cache = SemanticCache(threshold=0.99, size=2)
+    cache.put(unit(1, 0, 0), "a")
+    cache.put(unit(0, 1, 0), "b")
+    assert cache.get(unit(1, 0, 0)) == "a"  # "b" is now least recently used
+    cache.put(unit(0, 0, 1), "c")
+    assert cache.get(unit(0, 1, 0)) is None
+    assert cache.get(unit(1, 0, 0)) == "a"
+    assert cache.get(unit(0, 0, 1)) == "c"
@@ -0,0 +1,54 @@
+from core.chunker import LegalChunk
+from ingestion.validators import ContentValidator
+
+
+def make_chunk(**overrides) -> LegalChunk:
+    fields = dict(
+        law_code="BNS",
+        law_name="Bharatiya Nyaya Sanhita, 2023",
+        identifier_type="Section",
+        identifier_number="303",
+        text="Whoever commits theft shall be punished with imprisonment.",
+        chunk_id="bns-303",
+    )
+    fields.update(overrides)
+    return LegalChunk(**fields)
+
+
+def test_validate_chunks_accepts_valid_chunk():
+    assert ContentValidator.validate_chunks([make_chunk()]) == [True]
+
+
+def test_validate_chunk_matches_validate_chunks():
+    chunks = [make_chunk(), make_chunk(chunk_id="short", text="too short"),
+              make_chunk(chunk_id="bad-id", identifier_number="x12")]
+    assert ContentValidator.validate_chunks(chunks) == [True, False, False]
+    assert [ContentValidator.validate_chunk(c) for c in chunks] == [True, False, False]
+
+
+def test_validation_cache_is_bounded(monkeypatch):
+    from ingestion import validators
+
+    monkeypatch.setattr(validators, "_VALIDATION_CACHE_SIZE", 4)
+    validators._VALIDATION_CACHE.clear()
+    chunks = [make_chunk(chunk_id=str(i), identifier_number=str(i)) for i in range(10)]
+    assert ContentValidator.validate_chunks(chunks) == [True] * 10
+    assert len(validators._VALIDATION_CACHE) == 4
+
+
+def test_validate_chunks_warns_once_per_reason():
+    from loguru import logger
+
+    messages = []
+    sink = logger.add(lambda message: messages.append(message.record["message"]), level="WARNING")
+    try:
+        chunks = [make_chunk(chunk_id=f"short-{i}", text=f"short {i}") for i in range(5)]
+        chunks.append(make_chunk(chunk_id="bad-id", identifier_number="x12"))
+        chunks.append(make_chunk())
+        assert ContentValidator.validate_chunks(chunks) == [False] * 6 + [True]
+    finally:
+        logger.remove(sink)
+    assert sorted(messages) == [
+        "Skipped 1 chunks: has invalid identifier format",
+        "Skipped 5 chunks: has insufficient text",
+    ]
@@ -0,0 +1,122 @@
+import pickle
+import zlib
+
+import numpy as np
+import pytest
+
+faiss = pytest.importorskip("faiss")
+pytest.importorskip("sentence_transformers")
+
+from core.chunker import LegalChunk
+from indexing.vector_store import VectorStore
+
+DIM = 64
+
+
+class BagOfWordsModel:
+    """Deterministic stand-in for a SentenceTransformer: texts sharing words embed close together."""
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return DIM
+
+    def encode(self, texts, normalize_embeddings=False, **kwargs) -> np.ndarray:
+        vectors = np.zeros((len(texts), DIM), dtype=np.float32)
+        for row, text in zip(vectors, texts):
+            for word in text.lower().split():
+                row += np.random.default_rng(zlib.crc32(word.encode())).standard_normal(DIM)
+        if normalize_embeddings:
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors
+
+
+TEXTS = [
+    "Whoever commits theft shall be punished",
+    "Whoever commits murder shall be punished with death",
+    "Every arrested person shall be produced before a magistrate",
+]
+
+
+def make_chunks():
+    return [
+        LegalChunk(
+            law_code="BNS",
+            law_name="Bharatiya Nyaya Sanhita, 2023",
+            identifier_type="Section",
+            identifier_number=str(i),
+            text=text,
+            chunk_id=f"bns-{i}",
+        )
+        for i, text in enumerate(TEXTS, start=1)
+    ]
+
+
+def make_store(**kwargs) -> VectorStore:
+    store = VectorStore("bag-of-words", **kwargs)
+    store._model = BagOfWordsModel()
+    return store
+
+
+def top_hit(store: VectorStore, query: str) -> dict:
+    return store.search(query, top_k=1)[0]
+
+
+@pytest.mark.parametrize("index_type", [None, "Flat"])
+def test_save_load_round_trip(tmp_path, index_type):
+    store = make_store(index_type=index_type)
+    store.add_chunks(make_chunks())
+    store.save(str(tmp_path))
+
+    for read_only in (False, True):
+        loaded = make_store()
+        loaded.load(str(tmp_path), read_only=read_only)
+        hit = top_hit(loaded, "murder death")
+        assert hit["chunk_id"] == "bns-2"
+        assert hit["text"] == TEXTS[1]
+        assert set(hit) >= {"law_code", "identifier_number", "score", "text"}
+
+
+def test_read_only_store_rejects_writes(tmp_path):
+    store = make_store()
+    store.add_chunks(make_chunks())
+    store.save(str(tmp_path))
+
+    loaded = make_store()
+    loaded.load(str(tmp_path), read_only=True)
+    with pytest.raises(RuntimeError):
+        loaded.add_chunks(make_chunks())
+
+
+def test_flush_then_save(tmp_path):
+    store = make_store()
+    chunks = make_chunks()
+    for chunk in chunks:
+        store.add_chunks([chunk])
+        store.flush(str(tmp_path))
+    store.save(str(tmp_path))
+
+    loaded = make_store()
+    loaded.load(str(tmp_path), read_only=True)
+    assert loaded.index.ntotal == len(chunks)
+    assert top_hit(loaded, "arrested magistrate")["chunk_id"] == "bns-3"
+
+
+def test_loads_legacy_metadata_pickle(tmp_path):
+    # The original layout: an L2 flat index and the chunk dicts, text
+    # included, pickled in metadata.pkl
+    chunks = make_chunks()
+    index = faiss.IndexFlatL2(DIM)
+    index.add(BagOfWordsModel().encode([f" {chunk.text} " for chunk in chunks]))
+    faiss.write_index(index, str(tmp_path / "faiss.index"))
+    with open(tmp_path / "metadata.pkl", "wb") as f:
+        pickle.dump([chunk.model_dump() for chunk in chunks], f)
+
+    loaded = make_store()
+    loaded.load(str(tmp_path))
+    assert top_hit(loaded, "theft")["text"] == TEXTS[0]
+
+    # Saved in the current layout from then on
+    loaded.save(str(tmp_path))
+    reloaded = make_store()
+    reloaded.load(str(tmp_path), read_only=True)
+    assert len(reloaded.metadata) == len(chunks)
+    assert top_hit(reloaded, "theft")["chunk_id"] == "bns-1"
@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip("langgraph")
+
+from core.intent_classifier import IntentClassifier
+from orchestration.workflow import SMALL_TALK_REPLY, LegalRAGWorkflow
+
+
+class Unreachable:
+    """Fails the test if the small-talk route touches retrieval or generation."""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"small talk reached {name}")
+
+
+def make_workflow() -> LegalRAGWorkflow:
+    return LegalRAGWorkflow(IntentClassifier(), Unreachable(), Unreachable(), Unreachable(), Unreachable())
+
+
+def test_small_talk_skips_retrieval_and_generation():
+    workflow = make_workflow()
+    state = workflow.run("hello")
+    assert state["answer"] == SMALL_TALK_REPLY
+    assert "candidates" not in state and "error" not in state
+
+
+def test_small_talk_stream():
+    state = {}
+    assert list(make_workflow().stream("thanks", state)) == [SMALL_TALK_REPLY]
+    assert state["answer"] == SMALL_TALK_REPLY